@@ -13,14 +13,18 @@ class AAPAuthenticatorMap(AAPObject):
         super().__init__(module, params, **kwargs)
         self.authenticator = None
         self.new_authenticator = None
+        # Found authenticators by name or id, can be shared by the maps managed in one module run
+        self.authenticator_cache = kwargs.get('authenticator_cache', {})
 
-    def manage(self, **kwargs):
+    def manage(self, auto_exit=True, **kwargs):
         self.get_authenticator()
 
         if self.absent() and self.authenticator.data is None:
-            self.module.exit_json(**self.module.json_output)
+            if auto_exit:
+                self.module.exit_json(**self.module.json_output)
+            return
 
-        super().manage(**kwargs)
+        super().manage(auto_exit=auto_exit, **kwargs)
 
     def unique_field(self):
         return self.module.IDENTITY_FIELDS['authenticators']
@@ -31,6 +35,9 @@ class AAPAuthenticatorMap(AAPObject):
     def _get_authenticator(self, name_or_id):
         from ..module_utils.aap_authenticator import AAPAuthenticator
 
+        if name_or_id in self.authenticator_cache:
+            return self.authenticator_cache[name_or_id]
+
         params = {"name": name_or_id, "state": self.STATE_EXISTS}
 
         # If delete is required, cluster doesn't need to exist
@@ -39,6 +46,9 @@ class AAPAuthenticatorMap(AAPObject):
         authenticator = AAPAuthenticator(module=self.module, params=params)
         authenticator.manage(auto_exit=False, fail_when_not_exists=fail_when_not_exists)
 
+        # A missing authenticator is not cached, the next map may require it to exist
+        if authenticator.data is not None:
+            self.authenticator_cache[name_or_id] = authenticator
         return authenticator
 
     def get_authenticator(self):
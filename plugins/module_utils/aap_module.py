@@ -3,28 +3,57 @@ from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
 import base64
-
-# import os
+import fcntl
+import gzip
+import hashlib
+import io
+import os
+import ssl
+import tempfile
+import threading
 import time
 
 # from ansible.module_utils._text import to_bytes, to_native, to_text
 # import os.path
 # from socket import gethostbyname
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from json import dumps, loads
 
+from ansible.module_utils._text import to_bytes
 from ansible.module_utils.basic import AnsibleModule, env_fallback
 from ansible.module_utils.six import string_types
-from ansible.module_utils.six.moves.http_cookiejar import CookieJar
+from ansible.module_utils.six.moves.http_cookiejar import CookieJar, DefaultCookiePolicy
 
 # For Later
 # from ansible.module_utils.six import PY3
 from ansible.module_utils.six.moves.urllib.error import HTTPError
-from ansible.module_utils.six.moves.urllib.parse import quote, urlencode, urlparse
+from ansible.module_utils.six.moves.urllib.parse import quote, quote_plus, urlencode, urlparse
+from ansible.module_utils.six.moves.urllib.request import getproxies, proxy_bypass
 from ansible.module_utils.urls import ConnectionError, Request, SSLValidationError  # fetch_file,
 
 # import email.mime.multipart
 # import email.mime.application
 
+try:
+    import urllib3
+    from urllib3.util.retry import Retry
+
+    # Retry only counts the other errors since urllib3 1.26, older releases are left to Request
+    Retry(other=0)
+    HAS_URLLIB3 = True
+except (ImportError, TypeError):
+    HAS_URLLIB3 = False
+
+try:
+    # httpx only negotiates HTTP/2 when h2 is installed
+    import h2  # noqa: F401
+    import httpx
+
+    HAS_HTTPX = True
+except ImportError:
+    HAS_HTTPX = False
+
 
 class ItemNotDefined(Exception):
     pass
@@ -46,9 +75,36 @@ class AAPModuleError(Exception):
         return self.error_message
 
 
+class WorkerExit(BaseException):
+    """Raised in place of fail_json()/exit_json() inside a worker thread of AAPModule.run_concurrently().
+
+    Like SystemExit this is not an Exception, so it is not swallowed by ``except Exception`` blocks in the worker.
+    """
+
+    def __init__(self, method, kwargs):
+        self.method = method
+        self.kwargs = kwargs
+
+
+class HTTPXResponse:
+    """Expose an httpx response with the attributes make_request() reads from the other transports."""
+
+    def __init__(self, response):
+        self.status = response.status_code
+        self.reason = response.reason_phrase
+        self.headers = response.headers
+        self._response = response
+
+    def read(self):
+        return self._response.read()
+
+
 class AAPModule(AnsibleModule):
     url = None
     session = None
+    # Connection pools shared by every instance in the process, keyed on whether certificates are verified
+    pools = {}
+    http2_clients = {}
     AUTH_ARGSPEC = dict(
         gateway_hostname=dict(
             required=False,
@@ -105,15 +161,34 @@ class AAPModule(AnsibleModule):
         "users": "username",
         "role_definitions": "name",
     }
+    # Endpoint of the objects a role applies to, by the first word of the role definition name
+    ROLE_MAP = {
+        "Team": "teams",
+        "Organization": "organizations",
+    }
     host = "127.0.0.1"
     username = None
     password = None
     verify_ssl = True
     request_timeout = 10
+    max_page_size = 200
+    # Longest encoded value of an __in filter sent by get_many(), well within the request line limits of the usual proxies
+    max_in_query_length = 4000
     oauth_token = None
     authenticated = False
     error_callback = None
     warn_callback = None
+    # Shared by every instance in the process so that repeated name lookups only hit the API once, see get_one_cached()
+    resolve_cache = {}
+    resolve_cache_ttl = 600
+    resolve_cache_negative_ttl = 20
+    # Only these fields of the found items are kept, the cache is written to disk and its callers only need the id
+    resolve_cache_fields = ("id",)
+    # Found items are also handed over to the following tasks through a file, see load_resolver_cache()
+    resolve_cache_file_ttl = 60
+    resolve_cache_files = set()
+    max_workers = 8
+    worker_state = threading.local()
 
     def __init__(self, argument_spec=None, direct_params=None, error_callback=None, warn_callback=None, require_auth=True, **kwargs):
         full_argspec = {}
@@ -178,26 +253,21 @@ class AAPModule(AnsibleModule):
 
         url = self.build_url("")  # login
         try:
-            self.make_request_raw_reponse("GET", url)
+            # One probe of the API root is enough to validate the host, the credentials are sent with every later request
+            response = self.make_request_raw_reponse("GET", url)
         except AAPModuleError as e:
             self.fail_json(msg="Authentication error: {error}".format(error=e))
+        # Drain the body so that the connection is handed back to the pool for the next request
+        if hasattr(response, "read"):
+            response.read()
+
         if self.oauth_token:
-            try:
-                header = {"Authorization": "Bearer {0}".format(self.oauth_token)}
-                self.make_request("GET", url)
-                self.session.headers.update(header)
-                self.authenticated = True
-            except AAPModuleError as e:
-                self.fail_json(msg="Authentication with cookie error: {error}".format(error=e))
+            self.session.headers.update({"Authorization": "Bearer {0}".format(self.oauth_token)})
+            self.authenticated = True
         elif self.username and self.password:
-            try:
-                basic_str = base64.b64encode("{0}:{1}".format(self.username, self.password).encode("ascii"))
-                header = {"Authorization": "Basic {0}".format(basic_str.decode("ascii"))}
-                self.make_request("GET", url)
-                self.session.headers.update(header)
-                self.authenticated = True
-            except AAPModuleError as e:
-                self.fail_json(msg="Authentication error: {error}".format(error=e))
+            basic_str = base64.b64encode("{0}:{1}".format(self.username, self.password).encode("ascii"))
+            self.session.headers.update({"Authorization": "Basic {0}".format(basic_str.decode("ascii"))})
+            self.authenticated = True
 
     def validate_url(self, url):
         # Perform some basic validation
@@ -214,6 +284,8 @@ class AAPModule(AnsibleModule):
         return validated_url
 
     def fail_json(self, **kwargs):
+        if getattr(self.worker_state, "active", False):
+            raise WorkerExit("fail_json", kwargs)
         # Try to log out if we are authenticated
         if self.error_callback:
             self.error_callback(**kwargs)
@@ -221,9 +293,66 @@ class AAPModule(AnsibleModule):
             super(AAPModule, self).fail_json(**kwargs)
 
     def exit_json(self, **kwargs):
+        if getattr(self.worker_state, "active", False):
+            raise WorkerExit("exit_json", kwargs)
+        self.save_resolver_cache()
         # Try to log out if we are authenticated
         super(AAPModule, self).exit_json(**kwargs)
 
+    def run_concurrently(self, calls, completed_key=None):
+        """Run independent, I/O bound calls in a pool of up to ``max_workers`` threads.
+
+        :param calls: Callables taking no argument, typically :py:func:`functools.partial` of a lookup method.
+        :type calls: list
+        :param completed_key: If set, a fail_json() raised by a call also reports the values returned by the calls that
+            completed under this key, and whether any of them changed something.
+        :type completed_key: str
+
+        :return: The values returned by the calls, in the same order.
+        :rtype: list
+
+        A fail_json() or exit_json() raised by a call is replayed in the calling thread once the calls already running
+        have finished, the first one in call order wins. This keeps the module output to a single JSON document. The
+        calls that did not start by then are skipped, so a failed write does not leave the others to run unreported.
+        """
+        if len(calls) < 2:
+            return [call() for call in calls]
+
+        stopped = threading.Event()
+        skipped = object()
+
+        def run(call):
+            if stopped.is_set():
+                return skipped
+            self.worker_state.active = True
+            try:
+                return call()
+            except WorkerExit:
+                stopped.set()
+                raise
+            finally:
+                self.worker_state.active = False
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(calls))) as executor:
+            futures = [executor.submit(run, call) for call in calls]
+
+        results = []
+        first_exit = None
+        for future in futures:
+            try:
+                results.append(future.result())
+            except WorkerExit as e:
+                first_exit = first_exit or e
+        if first_exit is None:
+            return results
+
+        kwargs = dict(first_exit.kwargs)
+        if completed_key and first_exit.method == "fail_json":
+            completed = [result for result in results if result is not skipped]
+            kwargs[completed_key] = completed
+            kwargs.setdefault("changed", any(isinstance(result, dict) and result.get("changed") for result in completed))
+        getattr(self, first_exit.method)(**kwargs)
+
     def warn(self, warning):
         if self.warn_callback is not None:
             self.warn_callback(warning)
@@ -246,15 +375,22 @@ class AAPModule(AnsibleModule):
             url = url._replace(query=urlencode(query_params))
         return url
 
-    def make_request(self, method, url, wait_for_task=True, **kwargs):
+    def make_request(self, method, url, wait_for_task=True, return_body=True, **kwargs):
         """Perform an API call and return the data.
 
         :param method: GET, PUT, POST, or DELETE
         :type method: str
         :param url: URL to the API endpoint
         :type url: :py:class:``urllib.parse.ParseResult``
+        :param return_body: Whether to parse the returned data. When False the
+                            body is read and discarded, ``json`` is an empty
+                            dictionary and background tasks are not waited for.
+        :type return_body: bool
         :param kwargs: Additionnal parameter to pass to the API (headers, data
-                       for PUT and POST requests, ...)
+                       for PUT and POST requests, ...). With
+                       ``return_errors_on_4xx`` a HTTP 4xx response that is not
+                       an authentication or permission error is returned to
+                       the caller instead of failing the module.
 
         :raises AAPModuleError: The API request failed.
 
@@ -265,6 +401,8 @@ class AAPModule(AnsibleModule):
         """
 
         response = self.make_request_raw_reponse(method, url, **kwargs)
+        if isinstance(response, dict) and 400 <= response.get("status_code", 0) < 500 and kwargs.get("return_errors_on_4xx", False):
+            return response
         try:
             response_body = response.read()
         except Exception as e:
@@ -278,7 +416,7 @@ class AAPModule(AnsibleModule):
             raise AAPModuleError("Failed to read response body: {error}".format(error=e))
 
         response_json = {}
-        if response_body and response_body != "":
+        if return_body and response_body and response_body != "":
             try:
                 response_json = loads(response_body)
             except Exception as e:
@@ -330,19 +468,13 @@ class AAPModule(AnsibleModule):
         elif kwargs.get("binary", False):
             data = kwargs.get("data", None)
 
-        if method.upper() in {'PUT', 'POST', 'DELETE', 'PATCH'} and self.check_mode:
+        is_write = method.upper() in {'PUT', 'POST', 'DELETE', 'PATCH'}
+        if is_write and self.check_mode:
             self.json_output['changed'] = True
             self.exit_json(**self.json_output)
 
         try:
-            response = self.session.open(
-                method,
-                url.geturl(),
-                validate_certs=self.verify_ssl,
-                timeout=self.request_timeout,
-                follow_redirects=True,
-                data=data,
-            )
+            response = self._open(method, url, data=data)
         except SSLValidationError as ssl_err:
             self.fail_json(msg="Could not establish a secure connection to your host ({1}): {0}.".format(url.netloc, ssl_err))
         except ConnectionError as con_err:
@@ -397,8 +529,131 @@ class AAPModule(AnsibleModule):
         except Exception as e:
             self.fail_json(msg="There was an unknown error when trying to connect to {2}: {0} {1}".format(type(e).__name__, e, url))
 
+        if is_write and 200 <= getattr(response, "status", 204) < 300:
+            # A write can create or rename items of the endpoint it targets, and a delete may cascade to other endpoints.
+            # The caches are only invalidated once the write is applied, so that a lookup sent while it was in flight
+            # is older than the invalidation and cannot be saved back
+            written_endpoint = None if method.upper() == 'DELETE' else self.get_endpoint_from_url(url)
+            self.clear_resolver_cache(written_endpoint)
+            self.invalidate_resolver_cache_file(written_endpoint)
+        return response
+
+    def _proxied(self):
+        # Proxied connections are left to Request, which honours the *_proxy environment variables
+        return self.host_url.scheme in getproxies() and not proxy_bypass(self.host_url.hostname)
+
+    def _use_http2(self):
+        # HTTP/2 is only negotiated over TLS
+        return HAS_HTTPX and self.host_url.scheme == "https" and not self._proxied()
+
+    def _use_pool(self):
+        return HAS_URLLIB3 and not self._proxied()
+
+    def _get_http2_client(self):
+        # Shared like the urllib3 pools. Concurrent requests are multiplexed over one connection instead of each
+        # needing a connection of its own
+        client = self.http2_clients.get(self.verify_ssl)
+        if client is None:
+            # The system trust store, as used by the other transports, rather than the certifi bundle of httpx
+            verify = ssl.create_default_context() if self.verify_ssl else False
+            transport = httpx.HTTPTransport(
+                http2=True,
+                verify=verify,
+                retries=2,
+                limits=httpx.Limits(max_keepalive_connections=self.max_workers),
+            )
+            # The client is shared across hosts and credentials, so it must not keep the cookies of one for the others.
+            # Requests are authenticated by their Authorization header, like on the pool which sends no cookies either
+            cookies = CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+            client = self.http2_clients.setdefault(
+                self.verify_ssl,
+                httpx.Client(transport=transport, cookies=cookies, follow_redirects=True, trust_env=False),
+            )
+        return client
+
+    def _get_pool(self):
+        # Built lazily so that verify_ssl has already been read from the module params. Sharing the pool lets the
+        # lookup plugin, which builds a module per call, keep its connections, and a pool as large as the number of
+        # run_concurrently() workers keeps one connection per worker
+        pool = self.pools.get(self.verify_ssl)
+        if pool is None:
+            if not self.verify_ssl:
+                urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+            pool = self.pools.setdefault(
+                self.verify_ssl,
+                urllib3.PoolManager(num_pools=2, maxsize=self.max_workers, block=False, cert_reqs="CERT_REQUIRED" if self.verify_ssl else "CERT_NONE"),
+            )
+        return pool
+
+    def _open(self, method, url, data=None):
+        """Send a request to the gateway, over HTTP/2 when httpx and h2 are available, otherwise reusing a keep-alive
+        connection when urllib3 is available.
+
+        httpx and urllib3 failures are translated into the exceptions raised by
+        :py:class:`ansible.module_utils.urls.Request` so that callers handle every transport the same way.
+        """
+        if self._use_http2():
+            return self._open_http2(method, url, data=data)
+
+        if not self._use_pool():
+            # Request only knows how to decode gzip, and only on successful responses
+            try:
+                return self.session.open(
+                    method,
+                    url.geturl(),
+                    headers={"Accept-Encoding": "gzip"},
+                    validate_certs=self.verify_ssl,
+                    timeout=self.request_timeout,
+                    follow_redirects=True,
+                    data=data,
+                )
+            except HTTPError as he:
+                if (he.headers or {}).get("Content-Encoding", "").lower() != "gzip":
+                    raise
+                raise HTTPError(he.url, he.code, he.msg, he.headers, io.BytesIO(gzip.decompress(he.read())))
+
+        try:
+            response = self._get_pool().request(
+                method.upper(),
+                url.geturl(),
+                body=to_bytes(data, nonstring="passthru"),
+                headers=dict(self.session.headers, **{"Accept-Encoding": "gzip, deflate"}),
+                timeout=self.request_timeout,
+                retries=Retry(total=None, connect=2, read=2, redirect=5, other=0, backoff_factor=0.2),
+                preload_content=False,
+            )
+        except urllib3.exceptions.HTTPError as e:
+            reason = getattr(e, "reason", None) or e
+            if isinstance(reason, urllib3.exceptions.SSLError):
+                raise SSLValidationError(str(reason))
+            raise ConnectionError(str(reason))
+
+        if response.status >= 400:
+            raise HTTPError(url.geturl(), response.status, response.reason, response.headers, io.BytesIO(response.read()))
         return response
 
+    def _open_http2(self, method, url, data=None):
+        try:
+            response = self._get_http2_client().request(
+                method.upper(),
+                url.geturl(),
+                content=to_bytes(data, nonstring="passthru"),
+                headers=dict(self.session.headers),
+                timeout=self.request_timeout,
+            )
+        except httpx.HTTPError as e:
+            # httpx chains the ssl error raised by the handshake behind its own ConnectError
+            cause = e
+            while cause is not None and not isinstance(cause, ssl.SSLError):
+                cause = cause.__cause__ or cause.__context__
+            if cause is not None:
+                raise SSLValidationError(str(cause))
+            raise ConnectionError(str(e))
+
+        if response.status_code >= 400:
+            raise HTTPError(url.geturl(), response.status_code, response.reason_phrase, response.headers, io.BytesIO(response.content))
+        return HTTPXResponse(response)
+
     def create_or_update_if_needed(
         self,
         existing_item,
@@ -464,30 +719,8 @@ class AAPModule(AnsibleModule):
             # We have to rely on item_type being passed in since we don't have an existing item that declares its type
             # We will pull the item_name out from the new_item, if it exists
             response = {}
-            item_name = self.get_item_name(new_item, allow_unknown=True)
             response = self.make_request("POST", item_url, **{"data": new_item})
-
-            if response["status_code"] in [200, 201]:
-                self.json_output["name"] = "unknown"
-                for key in ("name", "username", "identifier", "hostname"):
-                    if key in response["json"]:
-                        self.json_output["name"] = response["json"][key]
-                        self.json_output[key] = response["json"][key]
-                # # Special case: objects without a natural "name" (e.g., role_team_assignments)
-                sf = response["json"].get("summary_fields") or {}
-                if self.json_output["name"] == "unknown" and sf:
-                    self.json_output["summary_fields"] = response["json"]["summary_fields"]
-
-                if item_type != "token":
-                    self.json_output["id"] = response["json"]["id"]
-                self.json_output["changed"] = True
-            else:
-                if "json" in response and "__all__" in response["json"]:
-                    self.fail_json(msg="Unable to create {0} {1}: {2}".format(item_type, item_name, response["json"]["__all__"][0]))
-                elif "json" in response:
-                    self.fail_json(msg="Unable to create {0} {1}: {2}".format(item_type, item_name, response["json"]))
-                else:
-                    self.fail_json(msg="Unable to create {0} {1}: {2}".format(item_type, item_name, response["status_code"]))
+            self.process_create_response(response, new_item, item_type, self.json_output)
 
         # Process any associations with this item
         if associations is not None:
@@ -505,6 +738,50 @@ class AAPModule(AnsibleModule):
             return last_data
         return None
 
+    def process_create_response(self, response, new_item, item_type, output):
+        # Record the created item in output, or fail the module if the create was refused
+        if response["status_code"] in [200, 201]:
+            output["name"] = "unknown"
+            for key in ("name", "username", "identifier", "hostname"):
+                if key in response["json"]:
+                    output["name"] = response["json"][key]
+                    output[key] = response["json"][key]
+            # # Special case: objects without a natural "name" (e.g., role_team_assignments)
+            sf = response["json"].get("summary_fields") or {}
+            if output["name"] == "unknown" and sf:
+                output["summary_fields"] = response["json"]["summary_fields"]
+
+            if item_type != "token":
+                output["id"] = response["json"]["id"]
+            output["changed"] = True
+        else:
+            item_name = self.get_item_name(new_item, allow_unknown=True)
+            if "json" in response and "__all__" in response["json"]:
+                self.fail_json(msg="Unable to create {0} {1}: {2}".format(item_type, item_name, response["json"]["__all__"][0]))
+            elif "json" in response:
+                self.fail_json(msg="Unable to create {0} {1}: {2}".format(item_type, item_name, response["json"]))
+            else:
+                self.fail_json(msg="Unable to create {0} {1}: {2}".format(item_type, item_name, response["status_code"]))
+
+    def create_many(self, endpoint, new_items, item_type="unknown"):
+        """Create every item of new_items, sending the POST requests side by side with :py:meth:`run_concurrently`.
+
+        The gateway has no bulk create endpoint, so this saves the time spent waiting on each request rather than the
+        requests themselves. Return the output of each create, in the order of new_items, in the format that
+        :py:meth:`create_if_needed` leaves in ``json_output``.
+
+        The first failed create fails the module: the creates not sent yet are skipped, and the output of the ones that
+        succeeded is reported under ``created``.
+        """
+        url = self.build_url(endpoint)
+
+        def create(new_item):
+            output = {"changed": False}
+            self.process_create_response(self.make_request("POST", url, data=new_item), new_item, item_type, output)
+            return output
+
+        return self.run_concurrently([partial(create, new_item) for new_item in new_items], completed_key="created")
+
     def update_if_needed(
         self,
         existing_item,
@@ -611,8 +888,17 @@ class AAPModule(AnsibleModule):
         return self.make_request("GET", url, **kwargs)
 
     def get_all_endpoint(self, endpoint, *args, **kwargs):
-        url = self.build_url(endpoint)
+        """Return a list view with the results of every page merged into the first one.
+
+        Pages are requested with ``max_page_size`` rows unless the ``data`` query sets another page_size. A response
+        other than 200 is returned as is so that the caller can report it.
+        """
+        query_params = dict(kwargs.pop("data", None) or {})
+        query_params.setdefault("page_size", self.max_page_size)
+        url = self.build_url(endpoint, query_params=query_params)
         response = self.make_request("GET", url, *args, **kwargs)
+        if response["status_code"] != 200:
+            return response
         if "next" not in response["json"]:
             raise RuntimeError("Expected list from API at {0}, got: {1}".format(endpoint, response))
         next_page = response["json"]["next"]
@@ -621,8 +907,11 @@ class AAPModule(AnsibleModule):
             self.fail_json(msg="The number of items being queried for is higher than 10,000.")
 
         while next_page is not None:
-            next_response = self.make_request("GET", next_page)
-            response["json"]["results"] = response["json"]["results"] + next_response["json"]["results"]
+            # The next link keeps the filters and page size of the first request
+            next_url = urlparse(next_page)
+            next_response = self.make_request("GET", self.host_url._replace(path=next_url.path, query=next_url.query))
+            # Extend in place, concatenating would copy every row fetched so far for each new page
+            response["json"]["results"].extend(next_response["json"]["results"])
             next_page = next_response["json"]["next"]
             response["json"]["next"] = next_page
         return response
@@ -672,7 +961,12 @@ class AAPModule(AnsibleModule):
                     new_data[name_field] = name_or_id
                 new_kwargs["data"] = new_data
 
-            url = self.build_url(endpoint, query_params=new_kwargs.get("data"))
+            query_params = dict(new_kwargs.get("data") or {})
+            # Two rows are enough to tell one match from many, except for a name or id search where the id match
+            # has to be picked out of the results
+            if "or__id" not in query_params:
+                query_params.setdefault("page_size", 2)
+            url = self.build_url(endpoint, query_params=query_params)
             response = self.make_request("GET", url)
 
             if response["status_code"] != 200:
@@ -704,6 +998,207 @@ class AAPModule(AnsibleModule):
             self.exit_json(**self.json_output)
         return response["json"]["results"][0]
 
+    def resolve_id(self, endpoint, name_or_id, allow_none=True, **kwargs):
+        """Return the id of the item found by :py:meth:`get_one_cached`, or None if there is no such item."""
+        item = self.get_one_cached(endpoint, name_or_id, allow_none=allow_none, **kwargs)
+        return item["id"] if item else None
+
+    def get_one_cached(self, endpoint, name_or_id, allow_none=True, **kwargs):
+        """Return the item found by :py:meth:`get_one`, meant for items that rarely change such as role definitions.
+
+        Only the ``resolve_cache_fields`` of the item are returned, objects such as applications are not cached in full
+        when the caller only needs their id. Lookups are cached for the lifetime of the process: found items for
+        ``resolve_cache_ttl`` seconds and missing items for ``resolve_cache_negative_ttl`` seconds. Writing to an endpoint drops its cached lookups, and any
+        delete clears the whole cache. Found items are also shared with the next tasks, see :py:meth:`load_resolver_cache`.
+        """
+        self.load_resolver_cache()
+        key = (self.host, endpoint, str(name_or_id), dumps(kwargs.get("data", {}), sort_keys=True))
+        now = time.time()
+        cached = self.resolve_cache.get(key)
+        if cached is not None and cached[0] > now and (cached[1] is not None or allow_none):
+            return cached[1]
+
+        item = self.get_one(endpoint, name_or_id=name_or_id, allow_none=allow_none, **kwargs)
+        if item:
+            item = dict((field, item[field]) for field in self.resolve_cache_fields if field in item)
+        ttl = self.resolve_cache_ttl if item else self.resolve_cache_negative_ttl
+        # The time the lookup was sent at tells whether a write made by another task since then invalidates it
+        self.resolve_cache[key] = (now + ttl, item or None, now)
+        return item
+
+    @classmethod
+    def clear_resolver_cache(cls, endpoint=None):
+        if endpoint is None:
+            cls.resolve_cache.clear()
+            return
+        # Writes may be sent from several run_concurrently() workers, so do not iterate the live dict
+        for key in list(cls.resolve_cache):
+            if key[1] == endpoint:
+                cls.resolve_cache.pop(key, None)
+
+    def resolver_cache_path(self):
+        # One file per gateway and user, as not every user can see the same items. The password never goes into the
+        # name, an unkeyed digest of it could be brute forced. A token is only used when there is no username, it is
+        # random enough for its digest to give nothing away
+        cache_dir = os.environ.get("XDG_RUNTIME_DIR") or os.path.join(os.path.expanduser("~"), ".ansible", "tmp")
+        identity = "\0".join(str(part) for part in (self.host, self.username or self.oauth_token))
+        digest = hashlib.blake2b(to_bytes(identity), digest_size=8).hexdigest()
+        return os.path.join(cache_dir, "aap_resolver_{0}.json".format(digest))
+
+    @staticmethod
+    def _is_invalidated(key, fetched, invalidated):
+        # Marks are recorded per endpoint, "*" for all of them
+        return any(invalidated.get(endpoint, 0) >= fetched for endpoint in (key[1], "*"))
+
+    def _read_resolver_cache_file(self, path):
+        entries = {}
+        invalidated = {}
+        try:
+            with open(path) as f:
+                content = loads(f.read())
+            now = time.time()
+            invalidated = dict(
+                (endpoint, marked)
+                for endpoint, marked in content["invalidated"].items()
+                if isinstance(marked, (int, float)) and marked > now - self.resolve_cache_ttl
+            )
+            for key, expires, item, fetched in content["entries"]:
+                key = tuple(key)
+                if expires > now and isinstance(item, dict) and not self._is_invalidated(key, fetched, invalidated):
+                    # Files written by older versions of the collection hold the items in full
+                    item = dict((field, item[field]) for field in self.resolve_cache_fields if field in item)
+                    entries[key] = (expires, item, fetched)
+        except (IOError, OSError, AttributeError, KeyError, TypeError, ValueError):
+            # A missing, unreadable or malformed file only means that the lookups are sent again
+            pass
+        return entries, invalidated
+
+    def _update_resolver_cache_file(self, update):
+        """Apply update(entries, invalidated) to the cache file, holding its lock so that the tasks running side by side
+        in other forks do not undo each other's changes."""
+        path = self.resolver_cache_path()
+        tmp_path = None
+        try:
+            os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+            with open(path + ".lock", "a") as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                entries, invalidated = self._read_resolver_cache_file(path)
+                update(entries, invalidated)
+                content = {
+                    "invalidated": invalidated,
+                    "entries": [[list(key), expires, item, fetched] for key, (expires, item, fetched) in entries.items()],
+                }
+                # mkstemp creates the file readable by its owner only, and the rename never exposes a partial write
+                fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".aap_resolver_")
+                with os.fdopen(fd, "w") as f:
+                    f.write(dumps(content))
+                os.replace(tmp_path, path)
+        except (IOError, OSError):
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def load_resolver_cache(self):
+        """Seed resolve_cache with the items found by the tasks that ran against the same gateway in the last minute.
+
+        Each task runs in its own process, so this is what lets a loop over many items resolve a shared name once.
+        The file is written by :py:meth:`save_resolver_cache` when the module exits, keeps the ids of found items only,
+        for at most ``resolve_cache_file_ttl`` seconds. A write to the API drops the items and records when it was made, see
+        :py:meth:`invalidate_resolver_cache_file`.
+        """
+        path = self.resolver_cache_path()
+        if path in self.resolve_cache_files:
+            return
+        self.resolve_cache_files.add(path)
+        for key, entry in self._read_resolver_cache_file(path)[0].items():
+            self.resolve_cache.setdefault(key, entry)
+
+    def save_resolver_cache(self):
+        path = self.resolver_cache_path()
+        if path not in self.resolve_cache_files:
+            return
+        now = time.time()
+        file_expires = now + self.resolve_cache_file_ttl
+        found = {
+            key: (min(expires, file_expires), item, fetched)
+            for key, (expires, item, fetched) in list(self.resolve_cache.items())
+            if item is not None and expires > now and key[0] == self.host
+        }
+
+        def merge(entries, invalidated):
+            # Keep what the other forks found as well, but not the items looked up before one of them wrote to the API
+            entries.update((key, entry) for key, entry in found.items() if not self._is_invalidated(key, entry[2], invalidated))
+
+        self._update_resolver_cache_file(merge)
+
+    def invalidate_resolver_cache_file(self, endpoint=None):
+        """Drop the items of an endpoint, or of every endpoint, from the cache file and record when, so that the tasks
+        still holding items looked up before this write do not save them back. The items of the other endpoints stay
+        shared, e.g. a user update leaves the role definitions cached."""
+        now = time.time()
+
+        def invalidate(entries, invalidated):
+            for key in list(entries):
+                if endpoint is None or key[1] == endpoint:
+                    del entries[key]
+            invalidated[endpoint or "*"] = now
+
+        self._update_resolver_cache_file(invalidate)
+
+    @staticmethod
+    def get_endpoint_from_url(url):
+        # /api/gateway/v1/<endpoint>/... -> <endpoint>
+        parts = [part for part in url.path.split("/") if part]
+        return parts[3] if len(parts) > 3 else None
+
+    def get_many(self, endpoint, lookup_field, values, **kwargs):
+        """Return all items of an endpoint whose lookup_field matches one of the given values.
+
+        The values are sent in ``<lookup_field>__in`` filters, up to ``max_page_size`` of them and
+        ``max_in_query_length`` encoded characters per query, so that a list of names or ids costs a single request in
+        the common case instead of one request per value. A value containing a comma cannot be expressed in that filter
+        and is queried on its own. When the server answers the ``__in`` filter with a client error, e.g. the filter is not
+        supported (HTTP 400) or the query is too long (HTTP 414), the values of the batch are queried one by one, side by
+        side with :py:meth:`run_concurrently`.
+        Values that do not match anything are simply missing from the result.
+        """
+        in_field = "{0}__in".format(lookup_field)
+        values = list(dict.fromkeys(str(value) for value in values))
+        batched = [value for value in values if "," not in value]
+        queries = [{lookup_field: value} for value in values if "," in value]
+        batch = []
+        batch_length = 0
+        for value in batched:
+            # The joining comma is sent as %2C
+            value_length = len(quote_plus(value)) + 3
+            if batch and (len(batch) == self.max_page_size or batch_length + value_length > self.max_in_query_length):
+                queries.append({in_field: ",".join(batch)})
+                batch = []
+                batch_length = 0
+            batch.append(value)
+            batch_length += value_length
+        if batch:
+            queries.append({in_field: ",".join(batch)})
+
+        data = kwargs.get("data", {})
+        results = []
+        for query in queries:
+            in_query = in_field in query
+            responses = [self.get_all_endpoint(endpoint, data=dict(data, **query), return_errors_on_4xx=in_query, return_errors_on_404=in_query)]
+            if 400 <= responses[0]["status_code"] < 500 and in_query:
+                # Older gateways do not support the __in filter on every field, and a proxy may still find the URL too long
+                responses = self.run_concurrently(
+                    [partial(self.get_all_endpoint, endpoint, data=dict(data, **{lookup_field: value})) for value in query[in_field].split(",")]
+                )
+
+            for response in responses:
+                if response["status_code"] != 200:
+                    fail_msg = "Got a {0} response when trying to get many from {1}".format(response["status_code"], endpoint)
+                    if "detail" in response.get("json", {}):
+                        fail_msg += ", detail: {0}".format(response["json"]["detail"])
+                    self.fail_json(msg=fail_msg)
+                results.extend(response["json"]["results"])
+        return results
+
     def fail_wanted_one(self, response, endpoint, query_params):
         sample = response.copy()
         if len(sample["json"]["results"]) > 1:
@@ -718,7 +1213,7 @@ class AAPModule(AnsibleModule):
 
     def objects_could_be_different(self, old, new, field_set=None, warning=False):
         if field_set is None:
-            field_set = set(fd for fd in new.keys() if fd not in ("modified", "related", "summary_fields"))
+            field_set = [fd for fd in new if fd not in ("modified", "related", "summary_fields")]
         for field in field_set:
             new_field = new.get(field, None)
             old_field = old.get(field, None)
@@ -782,15 +1277,19 @@ class AAPModule(AnsibleModule):
             else:
                 return self.json_output
 
+        self.process_delete_response(response, item_id, item_name, self.json_output, on_delete=on_delete)
+        if auto_exit:
+            self.exit_json(**self.json_output)
+        else:
+            return self.json_output
+
+    def process_delete_response(self, response, item_id, item_name, output, on_delete=None):
+        # Record the deleted item in output, or fail the module if the delete was refused
         if response["status_code"] in [202, 204]:
             if on_delete:
                 on_delete(self, response["json"])
-            self.json_output["changed"] = True
-            self.json_output["id"] = item_id
-            if auto_exit:
-                self.exit_json(**self.json_output)
-            else:
-                return self.json_output
+            output["changed"] = True
+            output["id"] = item_id
         else:
             if "json" in response and "__all__" in response["json"]:
                 self.fail_json(msg="Unable to delete {0}: {1}".format(item_name, response["json"]["__all__"][0]))
@@ -803,6 +1302,24 @@ class AAPModule(AnsibleModule):
             else:
                 self.fail_json(msg="Unable to delete {0}: {1}".format(item_name, response["status_code"]))
 
+    def delete_many(self, existing_items):
+        """Delete every item of existing_items, sending the DELETE requests side by side with :py:meth:`run_concurrently`.
+
+        Return the output of each delete, in the order of existing_items, in the format that :py:meth:`delete_if_needed`
+        leaves in ``json_output``.
+
+        The first failed delete fails the module: the deletes not sent yet are skipped, and the output of the ones that
+        succeeded is reported under ``deleted``.
+        """
+
+        def delete(existing_item):
+            output = {"changed": False}
+            response = self.make_request("DELETE", self.build_url(existing_item["url"]))
+            self.process_delete_response(response, existing_item["id"], self.get_item_name(existing_item, allow_unknown=True), output)
+            return output
+
+        return self.run_concurrently([partial(delete, existing_item) for existing_item in existing_items], completed_key="deleted")
+
     def get_enforced_defaults(self, endpoint, *args, **kwargs):
         endpoint_defaults = self.make_request("OPTIONS", self.build_url(endpoint))["json"]["actions"]["POST"]
 
@@ -818,7 +1335,8 @@ class AAPModule(AnsibleModule):
         depending on the unknown $encrypted$ value or sub-values
         """
         if isinstance(old_field, dict) and isinstance(new_field, dict):
-            if set(old_field.keys()) != set(new_field.keys()):
+            # Key views compare like sets without building any
+            if old_field.keys() != new_field.keys():
                 return False
             for key in new_field.keys():
                 if not AAPModule.fields_could_be_same(old_field[key], new_field[key]):
@@ -19,6 +19,7 @@ class AAPObject:
     def __init__(self, module, params=None, **kwargs):
         self.api_endpoint = kwargs.get('api_endpoint', self.API_ENDPOINT_NAME)
         self.data = None
+        self.data_fetched = False
         self.module = module
         self.new_fields = dict()
         self.params = params if params else module.params
@@ -74,22 +75,24 @@ class AAPObject:
                 self.module.exit_json(**self.module.json_output)
 
     def get_existing_item(self):
-        if self.data is None:
+        # Remember that the lookup was done so that a missing item is not looked up again
+        if self.data is None and not self.data_fetched:
             self.data = self.module.get_one(self.api_endpoint, name_or_id=self.unique_value())
+            self.data_fetched = True
 
         return self.data
 
     def set_name_field(self):
         # Update
-        name = self.module.params.get('new_name')
+        name = self.params.get('new_name')
         if name is not None:
             self.new_fields['name'] = name
         # Get from existing item
         elif self.data is not None:
             self.new_fields['name'] = self.data.get('name')
         # Get from params
-        elif self.module.params.get('name') is not None:
-            self.new_fields['name'] = self.module.params.get('name')
+        elif self.params.get('name') is not None:
+            self.new_fields['name'] = self.params.get('name')
 
     def unique_value(self):
         if self.params.get('id') is not None:
@@ -18,16 +18,18 @@ description:
     - Configure an automation platform gateway authenticator maps.
 options:
     name:
-      required: true
       type: str
-      description: The name of the authenticator mapping, must be unique
+      description:
+      - The name of the authenticator mapping, must be unique
+      - Required unless C(items) is set
     new_name:
       type: str
       description: Setting this option will change the existing name (looked up via the name field)
     authenticator:
       type: str
-      required: true
-      description: The name of ID referencing the Authenticator
+      description:
+      - The name of ID referencing the Authenticator
+      - Required when C(name) is set
     new_authenticator:
       type: str
       description: Setting this option will change the existing authenticator (looked up via the authenticator field)
@@ -68,6 +70,56 @@ options:
       - Items with the same order will be executed in random order
       - Value must be greater or equal to 0
       - Defaults to 0 (by API)
+    items:
+      type: list
+      elements: dict
+      description:
+      - A list of authenticator maps to manage in a single task, each item taking the same options as the module.
+      - Authenticators shared by several items are only looked up once.
+      - Mutually exclusive with the other map options, each item sets its own C(name), C(state) and so on.
+      suboptions:
+        name:
+          type: str
+          required: true
+          description: The name of the authenticator mapping, must be unique
+        new_name:
+          type: str
+          description: Setting this option will change the existing name (looked up via the name field)
+        authenticator:
+          type: str
+          required: true
+          description: The name of ID referencing the Authenticator
+        new_authenticator:
+          type: str
+          description: Setting this option will change the existing authenticator (looked up via the authenticator field)
+        revoke:
+          type: bool
+          default: false
+          description: If a user does not meet this rule should we revoke the permission
+        map_type:
+          type: str
+          description: What does the map work on, a team, a user flag or is this an allow rule
+          choices: ["allow", "is_superuser", "team", "organization", "role"]
+        team:
+          type: str
+          description: A team name this rule works on
+        organization:
+          type: str
+          description: An organization name this rule works on
+        role:
+          type: str
+          description: The name of the RBAC Role Definition to be used for this map
+        triggers:
+          type: dict
+          description: Trigger information for this rule
+        order:
+          type: int
+          description: The order in which this rule should be processed, smaller numbers are of higher precedence
+        state:
+          type: str
+          description: Desired state of the authenticator map.
+          choices: ["present", "absent", "exists", "enforced"]
+          default: "present"
 extends_documentation_fragment:
 - ansible.platform.state
 - ansible.platform.auth
@@ -277,33 +329,89 @@ EXAMPLES = """
     aap_request_timeout: 0
     aap_validate_certs: false
     state: present
+
+- name: Create several LDAP authentication maps in one task
+  ansible.platform.authenticator_map:
+    items:
+      - name: "Prod-HR-CaaC-Users-MAP-Team"
+        authenticator: "LDAPAuth"
+        map_type: team
+        role: Team Member
+        organization: "Prod-HR-CaaC"
+        team: prod-hr-team-users
+        triggers:
+          groups:
+            has_and:
+              - "cn=prod-hr-users,cn=groups,cn=accounts,dc=example,dc=com"
+        order: 2
+      - name: "Prod-IT-CaaC-Users-MAP-Team"
+        authenticator: "LDAPAuth"
+        map_type: team
+        role: Team Member
+        organization: "Prod-IT-CaaC"
+        team: prod-it-team-users
+        triggers:
+          groups:
+            has_and:
+              - "cn=prod-it-users,cn=groups,cn=accounts,dc=example,dc=com"
+        order: 2
+  register: result
 ...
 """
 
 from ..module_utils.aap_authenticator_map import AAPAuthenticatorMap  # noqa
 from ..module_utils.aap_module import AAPModule  # noqa
 
+ITEM_SPEC = dict(
+    name=dict(type="str", required=True),
+    new_name=dict(type="str"),
+    authenticator=dict(type="str", required=True),
+    new_authenticator=dict(type="str"),
+    revoke=dict(type="bool", default=False),
+    map_type=dict(type="str", choices=["allow", "is_superuser", "team", "organization", "role"]),
+    team=dict(type="str"),
+    role=dict(type="str"),
+    organization=dict(type="str"),
+    triggers=dict(type="dict"),
+    order=dict(type="int"),
+    state=dict(choices=["present", "absent", "exists", "enforced"], default="present"),
+)
+ARGUMENT_SPEC = dict(
+    ITEM_SPEC,
+    name=dict(type="str"),
+    authenticator=dict(type="str"),
+    items=dict(type="list", elements="dict", options=ITEM_SPEC),
+)
+# Every map option is set per item in items mode, a top level value would otherwise be silently ignored
+MUTUALLY_EXCLUSIVE = tuple((option, 'items') for option in ITEM_SPEC)
+REQUIRED_ONE_OF = (('name', 'items'),)
+REQUIRED_BY = {'name': 'authenticator'}
+
 
 def main():
-    argument_spec = dict(
-        name=dict(type="str", required=True),
-        new_name=dict(type="str"),
-        authenticator=dict(type="str", required=True),
-        new_authenticator=dict(type="str"),
-        revoke=dict(type="bool", default=False),
-        map_type=dict(type="str", choices=["allow", "is_superuser", "team", "organization", "role"]),
-        team=dict(type="str"),
-        role=dict(type="str"),
-        organization=dict(type="str"),
-        triggers=dict(type="dict"),
-        order=dict(type="int"),
-        state=dict(choices=["present", "absent", "exists", "enforced"], default="present"),
+    # Create a module with spec
+    module = AAPModule(
+        argument_spec=ARGUMENT_SPEC,
+        mutually_exclusive=MUTUALLY_EXCLUSIVE,
+        required_one_of=REQUIRED_ONE_OF,
+        required_by=REQUIRED_BY,
+        supports_check_mode=True,
     )
 
-    # Create a module with spec
-    module = AAPModule(argument_spec=argument_spec, supports_check_mode=True)
+    items = module.params.get('items')
+    if items is None:
+        AAPAuthenticatorMap(module).manage()
+        return
+
+    # The authenticators are looked up once for all the maps referencing them
+    authenticator_cache = {}
+    results = []
+    for item in items:
+        module.json_output = {"changed": False}
+        AAPAuthenticatorMap(module, params=item, authenticator_cache=authenticator_cache).manage(auto_exit=False)
+        results.append(module.json_output)
 
-    AAPAuthenticatorMap(module).manage()
+    module.exit_json(changed=any(r["changed"] for r in results), results=results)
 
 
 if __name__ == "__main__":
@@ -24,6 +24,8 @@ notes:
   - Organization Member role cannot be assigned to teams.
   - Only resource-scoped organization roles (e.g. "Organization Inventory Admin", "Organization Credential Admin") can be meaningfully assigned to teams.
   - Attempting unsupported role assignments will result in errors.
+  - The assignments of several C(assignment_objects) are created or deleted side by side. The first one that fails fails the task,
+    the ones not sent yet are skipped and the ones that succeeded are returned as C(created) or C(deleted).
 options:
     assignment_objects:
         description:
@@ -53,6 +55,20 @@ options:
                   - Resource id of the object this role applies to. Alternative to the object_id field.
                 required: False
                 type: str
+    object_id:
+        description:
+          - The primary key of the single object (team/organization) this assignment applies to.
+          - Shorthand for an I(assignment_objects) list holding only this object.
+          - Mutually exclusive with I(assignment_objects) and I(object_ansible_id).
+        required: False
+        type: int
+    object_ansible_id:
+        description:
+          - Resource id of the single object this role applies to. Alternative to the I(object_id) field.
+          - Shorthand for an I(assignment_objects) list holding only this object.
+          - Mutually exclusive with I(assignment_objects) and I(object_id).
+        required: False
+        type: str
     role_definition:
         description:
           - The role definition which defines permissions conveyed by this assignment.
@@ -113,6 +129,14 @@ EXAMPLES = '''
     state: present
     register: result
 
+- name: Role Team assignment for a single object using object_id
+  ansible.platform.role_team_assignment:
+    team: "APAC-BLR"
+    object_id: 2
+    role_definition: Organization Inventory Admin
+    state: present
+    register: result
+
 - name: Check Role Team assignment exists
   ansible.platform.role_team_assignment:
     team: "APAC-BLR"
@@ -133,33 +157,52 @@ EXAMPLES = '''
 ...
 '''
 
-from ..module_utils.aap_module import AAPModule
+from collections import defaultdict
+from functools import partial
 
+from ..module_utils.aap_module import AAPModule
 
-def assign_team_role(module, state, role_team_assignment, kwargs,
-                     role_definition_str, team_param, team_ansible_id, auto_exit=False):
+# Any additional arguments that are not fields of the item can be added here
+ARGUMENT_SPEC = dict(
+    role_definition=dict(required=True, type='str'),
+    team=dict(required=False, type='str'),
+    assignment_objects=dict(
+        required=False,
+        type='list',
+        elements='dict',
+        options=dict(
+            name=dict(type='str', required=False),
+            type=dict(type='str', required=False),
+            object_id=dict(required=False, type='int'),
+            object_ansible_id=dict(required=False, type='str'),
+        ),
+    ),
+    object_id=dict(required=False, type='int'),
+    object_ansible_id=dict(required=False, type='str'),
+    team_ansible_id=dict(required=False, type='str'),
+    state=dict(default='present', choices=['present', 'absent', 'exists']),
+)
+MUTUALLY_EXCLUSIVE = (
+    ('team', 'team_ansible_id'),
+    ('assignment_objects', 'object_id'),
+    ('assignment_objects', 'object_ansible_id'),
+    ('object_id', 'object_ansible_id'),
+)
+REQUIRED_ONE_OF = (('team', 'team_ansible_id'),)
+
+
+def assign_team_role(module, state, role_team_assignment, kwargs, role_definition_str, team_param, team_ansible_id, auto_exit=False):
     """
     Create/delete/assert a team role assignment.s.
     """
     if state == 'exists':
         if not role_team_assignment:
-            module.fail_json(
-                msg=(
-                    "Team role assignment does not exist: %s, team: %s"
-                    % (role_definition_str, team_param or team_ansible_id)
-                )
-            )
+            module.fail_json(msg=("Team role assignment does not exist: %s, team: %s" % (role_definition_str, team_param or team_ansible_id)))
     elif state == 'absent':
         module.delete_if_needed(role_team_assignment, auto_exit=auto_exit)
 
     elif state == 'present':
-        module.create_if_needed(
-            role_team_assignment,
-            kwargs,
-            endpoint='role_team_assignments',
-            item_type='role_team_assignment',
-            auto_exit=auto_exit
-        )
+        module.create_if_needed(role_team_assignment, kwargs, endpoint='role_team_assignments', item_type='role_team_assignment', auto_exit=auto_exit)
     return
 
 
@@ -180,15 +223,9 @@ def _validate_selector(entry, module):
 
     count = (1 if (has_name and has_type) else 0) + (1 if has_pk else 0) + (1 if has_uuid else 0)
     if count == 0:
-        module.fail_json(
-            msg="Each assignment_objects item must include exactly one of: "
-                "(name & type) OR object_id OR object_ansible_id."
-        )
+        module.fail_json(msg="Each assignment_objects item must include exactly one of: (name & type) OR object_id OR object_ansible_id.")
     if count > 1:
-        module.fail_json(
-            msg="Each assignment_objects item must not include more than one of: "
-                "(name & type), object_id, object_ansible_id."
-        )
+        module.fail_json(msg="Each assignment_objects item must not include more than one of: (name & type), object_id, object_ansible_id.")
 
     # Optional: constrain allowed types for name-based lookup
     if has_name and has_type:
@@ -197,37 +234,84 @@ def _validate_selector(entry, module):
             module.fail_json(msg=f"Unsupported type '{entry['type']}'. Valid types: {', '.join(allowed)}")
 
 
+def _selector(module, entry, entity_type):
+    """
+    Return the endpoint, lookup field and value identifying an assignment_objects item.
+    """
+    if entry.get('name') and entry.get('type'):
+        return entry['type'], module.get_name_field_from_endpoint(entry['type']), entry['name']
+    if entry.get('object_id') is not None:
+        return entity_type, 'id', str(entry['object_id'])
+    return entity_type, 'resource__ansible_id', entry['object_ansible_id']
+
+
+def _lookup_value(obj, lookup_field):
+    if lookup_field == 'resource__ansible_id':
+        return obj.get('summary_fields', {}).get('resource', {}).get('ansible_id')
+    return str(obj.get(lookup_field))
+
+
+def resolve_assignment_objects(module, object_param, entity_type):
+    """
+    Return the ids of the assignment_objects items.
+    The items are bucketed by endpoint and lookup field so that each bucket is resolved with a single request.
+    """
+    selectors = [_selector(module, entry, entity_type) for entry in object_param]
+    buckets = defaultdict(list)
+    for endpoint, lookup_field, value in selectors:
+        buckets[(endpoint, lookup_field)].append(value)
+
+    found = {}
+    for (endpoint, lookup_field), values in buckets.items():
+        for obj in module.get_many(endpoint, lookup_field, values):
+            key = (endpoint, lookup_field, _lookup_value(obj, lookup_field))
+            if key in found and found[key]['id'] != obj['id']:
+                module.fail_json(msg=f"More than one {endpoint} found with {lookup_field} {key[2]}")
+            found[key] = obj
+
+    entity_ids = []
+    for endpoint, lookup_field, value in selectors:
+        obj = found.get((endpoint, lookup_field, value))
+        if obj is None and lookup_field == 'resource__ansible_id':
+            # The object may not list its ansible_id in its summary fields, ask for it on its own
+            obj = module.get_one(endpoint, allow_none=True, data={'resource__ansible_id': value})
+        elif obj is None and lookup_field != 'id':
+            # Not found by name, the name may still be an id or a named URL
+            obj = module.get_one(endpoint, allow_none=True, name_or_id=value)
+        if obj is None:
+            module.fail_json(msg=f"Unable to find {endpoint} with {lookup_field} {value}")
+        entity_ids.append(obj['id'])
+    return entity_ids
+
+
 def main():
-    # Any additional arguments that are not fields of the item can be added here
-    argument_spec = dict(
-        role_definition=dict(required=True, type='str'),
-        team=dict(required=False, type='str'),
-        assignment_objects=dict(required=False, type='list', elements='dict', options=dict(
-            name=dict(type='str', required=False),
-            type=dict(type='str', required=False),
-            object_id=dict(required=False, type='int'),
-            object_ansible_id=dict(required=False, type='str'),
-        )),
-        team_ansible_id=dict(required=False, type='str'),
-        state=dict(default='present', choices=['present', 'absent', 'exists']),
-    )
     module = AAPModule(
-        argument_spec=argument_spec,
-        mutually_exclusive=[
-            ('team', 'team_ansible_id'),
-        ],
-        required_one_of=[
-            ('team', 'team_ansible_id'),
-        ],
+        argument_spec=ARGUMENT_SPEC,
+        mutually_exclusive=MUTUALLY_EXCLUSIVE,
+        required_one_of=REQUIRED_ONE_OF,
     )
     team_param = module.params.get('team')
     role_definition_str = module.params.get('role_definition')
     assignment_objects = module.params.get("assignment_objects")
     team_ansible_id = module.params.get('team_ansible_id')
+    object_id = module.params.get('object_id')
+    object_ansible_id = module.params.get('object_ansible_id')
     state = module.params.get('state')
 
-    role_definition = module.get_one('role_definitions', allow_none=False, name_or_id=role_definition_str)
-    team = module.get_one('teams', allow_none=True, name_or_id=team_param)
+    # A single object can be given at the top level, it then goes through the same code path as a list of one
+    if object_id is not None or object_ansible_id is not None:
+        assignment_objects = [dict(name=None, type=None, object_id=object_id, object_ansible_id=object_ansible_id)]
+
+    # Both lookups are independent, run them side by side to pay for a single round trip. They rarely change
+    # within a play, so the consecutive tasks share their results
+    lookups = [partial(module.get_one_cached, 'role_definitions', role_definition_str, allow_none=False)]
+    # Without a team name the team is given by team_ansible_id, which the API takes as is
+    if team_param:
+        lookups.append(partial(module.get_one_cached, 'teams', team_param, allow_none=True))
+    role_definition, team = (module.run_concurrently(lookups) + [None])[:2]
+    if team_param and team is None:
+        # Without the team the assignments below would only be filtered by role and object
+        module.fail_json(msg=f"Unable to find teams with name or id {team_param}")
 
     kwargs = {
         'role_definition': role_definition['id'],
@@ -237,48 +321,54 @@ def main():
     if team_ansible_id is not None:
         kwargs['team_ansible_id'] = team_ansible_id
 
-    role_map = {
-        'Team': 'teams',
-        'Organization': 'organizations',
-    }
-
-    entity_type = next((
-        mapped
-        for prefix, mapped in role_map.items()
-        if role_definition_str.startswith(prefix)
-    ), None)
+    entity_type = module.ROLE_MAP.get(role_definition_str.split(' ', 1)[0])
     object_param = assignment_objects
     results = []
 
     if role_definition_str.lower().startswith('platform') and role_definition["id"] == 1:
         role_team_assignment = module.get_one('role_team_assignments', **{'data': kwargs})
-        assign_team_role(module, state, role_team_assignment, kwargs,
-                         role_definition_str, team_param, team_ansible_id)
+        assign_team_role(module, state, role_team_assignment, kwargs, role_definition_str, team_param, team_ansible_id)
 
     elif entity_type and object_param:
         for entity in object_param:
             _validate_selector(entity, module)
+        # Generated lists may name the same object more than once, resolve each of them once
+        object_param = list(
+            {(entity.get('type'), entity.get('name'), entity.get('object_id'), entity.get('object_ansible_id')): entity for entity in object_param}.values()
+        )
+        entity_ids = resolve_assignment_objects(module, object_param, entity_type)
+
+        # Fetch the existing assignments of every object in one request instead of one request per object
+        existing_assignments = module.get_many('role_team_assignments', 'object_id', entity_ids, data=kwargs)
+        assignments_by_object = defaultdict(list)
+        for assignment in existing_assignments:
+            assignments_by_object[str(assignment['object_id'])].append(assignment)
+        for object_assignments in assignments_by_object.values():
+            if len(object_assignments) > 1:
+                # Refuse to guess which of them is meant, like get_one does
+                module.fail_json(
+                    msg="Request to role_team_assignments returned {0} items, expected 1".format(len(object_assignments)),
+                    query=dict(kwargs, object_id=object_assignments[0]['object_id']),
+                    total_results=len(object_assignments),
+                )
 
-            if entity['name'] and entity['type']:
-                obj = module.get_one(entity['type'], allow_none=False, name_or_id=entity['name'])
-            elif entity['object_id']:
-                obj = module.get_one(entity['object_id'], allow_none=False, name_or_id=entity['object_id'])
-            else:
-                obj = module.get_one(entity['object_ansible_id'], allow_none=False, name_or_id=entity['object_ansible_id'])
-
-            if obj is None:
-                module.fail_json(msg=f"Unable to find {entity['type']} with name {entity['name']}")
-            entity_id = obj['id']
-
-            if entity_id:
-                kwargs['object_id'] = entity_id
-
-            role_team_assignment = module.get_one('role_team_assignments', **{'data': kwargs})
-            assign_team_role(module, state, role_team_assignment, kwargs,
-                             role_definition_str, team_param, team_ansible_id)
-
-            # copy current state before it gets overwritten
-            results.append(module.json_output.copy())
+        pending_creates = []
+        pending_deletes = []
+        for entity_id in dict.fromkeys(entity_ids):
+            role_team_assignment = assignments_by_object.get(str(entity_id), [None])[0]
+            if state == 'exists':
+                assign_team_role(module, state, role_team_assignment, kwargs, role_definition_str, team_param, team_ansible_id)
+            elif state == 'present' and not role_team_assignment:
+                pending_creates.append((len(results), dict(kwargs, object_id=entity_id)))
+            elif state == 'absent' and role_team_assignment:
+                pending_deletes.append((len(results), role_team_assignment))
+            results.append({"changed": False})
+
+        # The writes are independent of each other, send them side by side once every object has been checked
+        created = module.create_many('role_team_assignments', [item for index, item in pending_creates], item_type='role_team_assignment')
+        deleted = module.delete_many([item for index, item in pending_deletes])
+        for (index, item), output in zip(pending_creates + pending_deletes, created + deleted):
+            results[index] = output
 
     # At the end, return *all* results
     module.exit_json(changed=any(r.get("changed", False) for r in results), assignments=results)
@@ -98,6 +98,23 @@ EXAMPLES = '''
 
 from ..module_utils.aap_module import AAPModule
 
+# Any additional arguments that are not fields of the item can be added here
+ARGUMENT_SPEC = dict(
+    user=dict(required=False, type='str'),
+    object_id=dict(required=False, type="int"),
+    object_ids=dict(required=False, type='list', elements='str'),
+    role_definition=dict(required=True, type='str'),
+    object_ansible_id=dict(required=False, type='str'),
+    user_ansible_id=dict(required=False, type='str'),
+    state=dict(default='present', choices=['present', 'absent', 'exists']),
+)
+MUTUALLY_EXCLUSIVE = (
+    ('user', 'user_ansible_id'),
+    ('object_ids', 'object_ansible_id'),
+    ('object_ids', 'object_id'),
+    ('object_id', 'object_ansible_id'),
+)
+
 
 def assign_user_role(module, auto_exit=False, **role_args):
     """
@@ -117,8 +134,6 @@ def assign_user_role(module, auto_exit=False, **role_args):
             )
         )
 
-        module.exit_json(**module.json_output)
-
     elif role_args.get('state') == 'absent':
         module.delete_if_needed(role_args.get('role_user_assignment'))
 
@@ -134,25 +149,9 @@ def assign_user_role(module, auto_exit=False, **role_args):
 
 
 def main():
-    # Any additional arguments that are not fields of the item can be added here
-    argument_spec = dict(
-        user=dict(required=False, type='str'),
-        object_id=dict(required=False, type="int"),
-        object_ids=dict(required=False, type='list', elements='str'),
-        role_definition=dict(required=True, type='str'),
-        object_ansible_id=dict(required=False, type='str'),
-        user_ansible_id=dict(required=False, type='str'),
-        state=dict(default='present', choices=['present', 'absent', 'exists']),
-    )
-
     module = AAPModule(
-        argument_spec=argument_spec,
-        mutually_exclusive=[
-            ('user', 'user_ansible_id'),
-            ('object_ids', 'object_ansible_id'),
-            ('object_ids', 'object_id'),
-            ('object_id', 'object_ansible_id')
-        ],
+        argument_spec=ARGUMENT_SPEC,
+        mutually_exclusive=MUTUALLY_EXCLUSIVE,
     )
 
     user_param = module.params.get('user')
@@ -163,8 +162,9 @@ def main():
     user_ansible_id = module.params.get('user_ansible_id')
     state = module.params.get('state')
 
-    role_definition = module.get_one('role_definitions', allow_none=False, name_or_id=role_definition_str)
-    user = module.get_one('users', allow_none=True, name_or_id=user_param)
+    role_definition = module.get_one_cached('role_definitions', role_definition_str, allow_none=False)
+    # Without a user name the user is given by user_ansible_id, which the API takes as is
+    user = module.get_one('users', allow_none=True, name_or_id=user_param) if user_param else None
 
     kwargs = {
         'role_definition': role_definition['id'],
@@ -186,16 +186,7 @@ def main():
     if user_ansible_id is not None:
         kwargs['user_ansible_id'] = user_ansible_id
 
-    role_map = {
-        'Team': 'teams',
-        'Organization': 'organizations',
-    }
-
-    entity_type = next((
-        mapped
-        for prefix, mapped in role_map.items()
-        if role_definition_str.startswith(prefix)
-    ), None)
+    entity_type = module.ROLE_MAP.get(role_definition_str.split(' ', 1)[0])
     object_param = object_ids or object_id
 
     role_args = {
@@ -216,12 +207,12 @@ def main():
         for entity in object_param:
 
             if not isinstance(entity, int):
-                response = module.get_one(entity_type, allow_none=True, name_or_id=entity)
-                if response is None:
+                entity_id = module.resolve_id(entity_type, entity)
+                if entity_id is None:
                     module.fail_json(
                         msg=f"Unable to find {entity_type} with name or id: {entity}"
                     )
-                entity = response.get('id')
+                entity = entity_id
 
             if entity:
                 kwargs['object_id'] = entity
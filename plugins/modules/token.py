@@ -191,9 +191,9 @@ def main():
     search_fields = {}
     if application:
         if organization:
-            organization_id = module.get_one('organizations', name_or_id=organization, allow_none=False)['id']
+            organization_id = module.resolve_id('organizations', organization, allow_none=False)
             search_fields['organization'] = organization_id
-        application_id = module.get_one('applications', name_or_id=application, allow_none=False, **{'data': search_fields})['id']
+        application_id = module.resolve_id('applications', application, allow_none=False, **{'data': search_fields})
 
     # Create the data that gets sent for create and update
     new_fields = {}
@@ -147,30 +147,32 @@ EXAMPLES = """
 ...
 """
 
+from functools import partial  # noqa
+
 from ..module_utils.aap_module import AAPModule  # noqa
 from ..module_utils.aap_user import AAPUser  # noqa
 
+# Any additional arguments that are not fields of the item can be added here
+ARGUMENT_SPEC = dict(
+    username=dict(required=True),
+    first_name=dict(),
+    last_name=dict(),
+    email=dict(),
+    is_superuser=dict(type="bool", aliases=["superuser"]),
+    is_platform_auditor=dict(type="bool", aliases=["auditor"]),
+    password=dict(no_log=True),
+    organizations=dict(type="list", elements='str'),
+    update_secrets=dict(type="bool", default=True, no_log=False),
+    authenticators=dict(type="list", elements='str'),
+    authenticator_uid=dict(),
+    associated_authenticators=dict(type="dict"),
+    state=dict(choices=["present", "absent", "exists", "enforced"], default="present"),
+)
 
-def main():
-    # Any additional arguments that are not fields of the item can be added here
-    argument_spec = dict(
-        username=dict(required=True),
-        first_name=dict(),
-        last_name=dict(),
-        email=dict(),
-        is_superuser=dict(type="bool", aliases=["superuser"]),
-        is_platform_auditor=dict(type="bool", aliases=["auditor"]),
-        password=dict(no_log=True),
-        organizations=dict(type="list", elements='str'),
-        update_secrets=dict(type="bool", default=True, no_log=False),
-        authenticators=dict(type="list", elements='str'),
-        authenticator_uid=dict(),
-        associated_authenticators=dict(type="dict"),
-        state=dict(choices=["present", "absent", "exists", "enforced"], default="present"),
-    )
 
+def main():
     # Create a module for ourselves
-    module = AAPModule(argument_spec=argument_spec, supports_check_mode=True)
+    module = AAPModule(argument_spec=ARGUMENT_SPEC, supports_check_mode=True)
 
     if module.params["organizations"]:
         module.deprecate(
@@ -204,18 +206,21 @@ def main():
             collection_name="ansible.platform",
         )
 
+    user = AAPUser(module)
     user_existed_before = True
     try:
-        existing_user = module.get_one('users', module.params.get('username'), allow_none=True)
+        # manage() reuses the item fetched here instead of looking the user up a second time
+        existing_user = user.get_existing_item()
         user_existed_before = existing_user is not None
     except (ConnectionError, TimeoutError) as e:
         module.fail_json(msg=f"Connection error while checking if user exists: {str(e)}")
 
-    AAPUser(module).manage(auto_exit=False)
+    user.manage(auto_exit=False)
 
     if module.params.get('state') in ['present', 'enforced']:
         process_organizations(module, user_existed_before)
-        audit_user(module)
+        if module.params.get('is_platform_auditor') is not None:
+            audit_user(module, user.data)
 
     module.exit_json(**module.json_output)
 
@@ -242,31 +247,43 @@ def process_organizations(module, user_existed_before):
         error_msg.append(f"Invalid value or parameter: {str(e)}")
 
     try:
-        role_definition = module.get_one('role_definitions', "Organization Member", allow_none=False)
+        role_definition = module.get_one_cached('role_definitions', "Organization Member", allow_none=False)
         role_definition_id = role_definition['id']
     except ConnectionError as e:
         error_msg.append(f"Failed to fetch role definition: {str(e)}")
 
+    # Resolve all organization names in one request, anything not found by name (e.g. an id) is looked up on its own
+    orgs_by_name = {org['name']: org for org in module.get_many('organizations', 'name', organizations)}
+
+    associations = []
     for organization in organizations:
         try:
-            org = module.get_one('organizations', organization, allow_none=True)
-            if not org:
-                error_msg.append(f"Organization '{organization}' not found. Please ensure it exists and is accessible.")
-                continue
-
-            org_id = org['id']
-            url = module.build_url("role_user_assignments")
-            payload = {"object_id": org_id, "user": user_id, "role_definition": role_definition_id}
-            associate_result = module.make_request("POST", url, data=payload)
-            if associate_result.get('status_code') not in [200, 201]:
-                error_msg.append(f"Failed to associate user with organization {organization}. API response: {associate_result}")
-                continue
-            changed = True
+            org = orgs_by_name.get(organization) or module.get_one('organizations', organization, allow_none=True)
         except (ConnectionError, TimeoutError) as e:
             error_msg.append(f"Connection error while processing organization '{organization}': {str(e)}")
             continue
+        if not org:
+            error_msg.append(f"Organization '{organization}' not found. Please ensure it exists and is accessible.")
+            continue
+        associations.append((organization, org['id']))
+
+    # The associations are independent of each other, send them side by side over the connection pool
+    url = module.build_url("role_user_assignments")
+    results = module.run_concurrently(
+        [
+            partial(associate_organization, module, url, organization, {"object_id": org_id, "user": user_id, "role_definition": role_definition_id})
+            for organization, org_id in associations
+        ]
+    )
+    for organization, associate_result in results:
+        if isinstance(associate_result, str):
+            error_msg.append(associate_result)
+        elif associate_result.get('status_code') not in [200, 201]:
+            error_msg.append(f"Failed to associate user with organization {organization}. API response: {associate_result}")
+        else:
+            changed = True
 
-        module.json_output['changed'] = changed
+    module.json_output['changed'] = changed
 
     if error_msg and not user_existed_before and user_id:
         if cleanup_user(module, user_id):
@@ -278,41 +295,52 @@ def process_organizations(module, user_existed_before):
         module.fail_json(msg=error_msg)
 
 
+def associate_organization(module, url, organization, payload):
+    try:
+        return organization, module.make_request("POST", url, return_body=False, data=payload)
+    except (ConnectionError, TimeoutError) as e:
+        return organization, f"Connection error while processing organization '{organization}': {str(e)}"
+
+
 def cleanup_user(module, user_id):
 
     try:
         delete_url = module.build_url(f'users/{user_id}/')
-        delete_result = module.make_request('DELETE', delete_url)
+        delete_result = module.make_request('DELETE', delete_url, return_body=False)
         return delete_result.get('status_code') == 204
     except (ConnectionError, TimeoutError):
         return False
 
 
-def audit_user(module):
+def get_auditor_role_definition_id(module):
     try:
-        user_data = module.get_one('users', module.params.get('username'), allow_none=False)
-        user_id = user_data['id']
-    except Exception as e:
-        module.fail_json(msg=f"Failed to fetch user data: {str(e)}")
-    try:
-        role_definition = module.get_one('role_definitions', "Platform Auditor", allow_none=False)
-        role_definition_id = role_definition['id']
+        return module.get_one_cached('role_definitions', "Platform Auditor", allow_none=False)['id']
     except Exception as e:
         module.fail_json(msg=f"Failed to fetch role definition: {str(e)}")
+
+
+def audit_user(module, user_data=None):
+    # The record returned by the create or update already tells whether the user is an auditor
+    if not user_data or 'is_platform_auditor' not in user_data:
+        try:
+            user_data = module.get_one('users', module.params.get('username'), allow_none=False)
+        except Exception as e:
+            module.fail_json(msg=f"Failed to fetch user data: {str(e)}")
+    user_id = user_data['id']
     if module.params.get('is_platform_auditor') and not user_data['is_platform_auditor']:
         payload = {
-            "role_definition": role_definition_id,
+            "role_definition": get_auditor_role_definition_id(module),
             "user": user_id,
         }
         url = module.build_url("role_user_assignments/")
         try:
-            module.make_request("POST", url, data=payload)
+            module.make_request("POST", url, return_body=False, data=payload)
             module.json_output["changed"] = True
         except Exception as e:
             module.fail_json(msg=f"Failed to assign platform auditor role: {str(e)}")
 
     if module.params.get('is_platform_auditor') is False and user_data['is_platform_auditor']:
-        kwargs = {'role_definition': role_definition_id, 'user': user_id}
+        kwargs = {'role_definition': get_auditor_role_definition_id(module), 'user': user_id}
         try:
             role_user_assignment = module.get_one('role_user_assignments', **{'data': kwargs})['id']
         except Exception as e:
@@ -320,7 +348,7 @@ def audit_user(module):
         user_data['is_platform_auditor'] = False
         url = module.build_url(f"role_user_assignments/{role_user_assignment}")
         try:
-            module.make_request("DELETE", url)
+            module.make_request("DELETE", url, return_body=False)
             module.json_output["changed"] = True
         except Exception as e:
             module.fail_json(msg=f"Failed to remove platform auditor role: {str(e)}")
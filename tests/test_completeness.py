@@ -35,7 +35,6 @@ ignore_module_parameters = ['state', 'new_name', 'new_organization', 'new_authen
 ignore_api_parameters = {
     'team': ['users', 'admins'],  # TODO: remove when removed from API
     'organization': ['users', 'admins'],  # TODO: remove when removed from API
-    'role_team_assignment': ['object_ansible_id', 'object_id'],  # TODO: remove when removed from API
 }
 
 # Some modules take additional parameters that do not appear in the API
@@ -0,0 +1,138 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import importlib
+import io
+import json
+
+import pytest
+from ansible.module_utils import basic
+from ansible.module_utils._text import to_bytes
+from ansible.module_utils.six.moves.urllib.error import HTTPError
+from ansible.module_utils.six.moves.urllib.parse import parse_qsl
+from ansible_collections.ansible.platform.plugins.module_utils.aap_module import AAPModule, AAPModuleError
+
+GATEWAY_PARAMS = dict(gateway_hostname="https://gateway.example.com", gateway_username="admin", gateway_password="secret")
+
+
+class FakeResponse:
+    def __init__(self, status, body=None):
+        self.status = status
+        self.body = b"" if body is None else json.dumps(body).encode()
+
+    def read(self):
+        return self.body
+
+
+class FakeGateway:
+    """Stand in for the transport of AAPModule, answering from handlers registered by method and endpoint."""
+
+    def __init__(self):
+        self.requests = []
+        self.handlers = {}
+
+    def route(self, method, endpoint, handler):
+        self.handlers[(method, endpoint)] = handler
+
+    def open(self, method, url, data=None):
+        query = dict(parse_qsl(url.query))
+        self.requests.append((method, "/" + url.path.lstrip("/"), query))
+        handler = self.handlers.get((method, AAPModule.get_endpoint_from_url(url)))
+        if handler is None:
+            # The probe of the API root sent when authenticating
+            return FakeResponse(200, {})
+        status, body = handler(query, json.loads(data) if data else None)
+        if status >= 400:
+            raise HTTPError(url.geturl(), status, "Error", {}, io.BytesIO(json.dumps(body).encode()))
+        return FakeResponse(status, body)
+
+    def sent(self, method, endpoint):
+        return [query for sent_method, path, query in self.requests if sent_method == method and path == "/api/gateway/v1/{0}/".format(endpoint)]
+
+    @staticmethod
+    def list_view(items):
+        """Return a handler filtering items like the gateway list views do."""
+
+        def lookup(item, field):
+            if field == "resource__ansible_id":
+                return item.get("summary_fields", {}).get("resource", {}).get("ansible_id")
+            return str(item.get(field))
+
+        def handler(query, data):
+            results = items
+            alternatives = [(field[len("or__") :], value) for field, value in query.items() if field.startswith("or__")]
+            if alternatives:
+                results = [item for item in results if any(lookup(item, field) == value for field, value in alternatives)]
+            for field, value in query.items():
+                if field == "page_size" or field.startswith("or__"):
+                    continue
+                if field.endswith("__in"):
+                    results = [item for item in results if lookup(item, field[: -len("__in")]) in value.split(",")]
+                else:
+                    results = [item for item in results if lookup(item, field) == value]
+            return 200, {"count": len(results), "next": None, "results": results}
+
+        return handler
+
+
+@pytest.fixture
+def isolated_caches(monkeypatch, tmp_path):
+    # Every test starts with empty caches, and its own cache file
+    monkeypatch.setattr(AAPModule, "resolve_cache", {})
+    monkeypatch.setattr(AAPModule, "resolve_cache_files", set())
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+
+
+@pytest.fixture
+def gateway(monkeypatch, isolated_caches):
+    fake = FakeGateway()
+    monkeypatch.setattr(AAPModule, "_open", lambda self, method, url, data=None: fake.open(method, url, data=data))
+    return fake
+
+
+@pytest.fixture
+def get_module():
+    """Return a factory of AAPModule instances whose fail_json() raises AAPModuleError."""
+
+    def error_callback(**kwargs):
+        raise AAPModuleError(kwargs["msg"])
+
+    def factory(**params):
+        module = AAPModule(argument_spec={}, direct_params=dict(GATEWAY_PARAMS, **params), error_callback=error_callback)
+        module.check_mode = False
+        return module
+
+    return factory
+
+
+class ModuleExit(Exception):
+    def __init__(self, result):
+        super(ModuleExit, self).__init__(result.get("msg"))
+        self.result = result
+
+
+@pytest.fixture
+def run_module(monkeypatch):
+    """Return a function running the main() of a module with the given parameters, returning its result."""
+
+    def exit_json(self, **kwargs):
+        raise ModuleExit(dict(kwargs, failed=False))
+
+    def fail_json(self, **kwargs):
+        raise ModuleExit(dict(kwargs, failed=True))
+
+    monkeypatch.setattr(basic.AnsibleModule, "exit_json", exit_json)
+    monkeypatch.setattr(basic.AnsibleModule, "fail_json", fail_json)
+    # The profile is only known to recent ansible-core releases
+    monkeypatch.setattr(basic, "_ANSIBLE_PROFILE", "legacy", raising=False)
+
+    def run(name, params, check_mode=False):
+        module_args = dict(GATEWAY_PARAMS, _ansible_check_mode=check_mode, **params)
+        monkeypatch.setattr(basic, "_ANSIBLE_ARGS", to_bytes(json.dumps({"ANSIBLE_MODULE_ARGS": module_args})))
+        module = importlib.import_module("ansible_collections.ansible.platform.plugins.modules.{0}".format(name))
+        with pytest.raises(ModuleExit) as result:
+            module.main()
+        return result.value.result
+
+    return run
@@ -0,0 +1,201 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import threading
+from functools import partial
+
+import pytest
+from ansible_collections.ansible.platform.plugins.module_utils.aap_module import AAPModuleError
+
+ORGANIZATIONS = [{"id": pk, "name": "org{0}".format(pk), "url": "/api/gateway/v1/organizations/{0}/".format(pk)} for pk in range(1, 6)]
+
+
+def test_run_concurrently_keeps_the_call_order(gateway, get_module):
+    module = get_module()
+    assert module.run_concurrently([partial(pow, value, 2) for value in range(10)]) == [value**2 for value in range(10)]
+
+
+def test_run_concurrently_replays_fail_json_in_the_calling_thread(gateway, get_module):
+    module = get_module()
+    failed_in = []
+
+    def error_callback(**kwargs):
+        failed_in.append(threading.current_thread())
+        raise AAPModuleError(kwargs["msg"])
+
+    module.error_callback = error_callback
+    calls = [partial(int, "1"), partial(module.fail_json, msg="first failure"), partial(module.fail_json, msg="second failure")]
+    with pytest.raises(AAPModuleError, match="first failure"):
+        module.run_concurrently(calls)
+    assert failed_in == [threading.current_thread()]
+    assert not getattr(module.worker_state, "active", False)
+
+
+def test_run_concurrently_skips_the_calls_not_started_after_a_failure(gateway, get_module):
+    module = get_module()
+    module.max_workers = 1
+    ran = []
+    calls = [partial(ran.append, 1), partial(module.fail_json, msg="failure"), partial(ran.append, 3)]
+
+    with pytest.raises(AAPModuleError, match="failure"):
+        module.run_concurrently(calls)
+    assert ran == [1]
+
+
+def test_create_many_returns_the_output_of_each_create(gateway, get_module):
+    created = []
+
+    def handler(query, data):
+        created.append(data)
+        return 201, dict(data, id=100 + data["object_id"])
+
+    gateway.route("POST", "role_team_assignments", handler)
+    module = get_module()
+
+    outputs = module.create_many("role_team_assignments", [{"object_id": 1}, {"object_id": 2}], item_type="role_team_assignment")
+
+    assert [output["id"] for output in outputs] == [101, 102]
+    assert all(output["changed"] for output in outputs)
+    assert sorted(item["object_id"] for item in created) == [1, 2]
+
+
+def test_create_many_reports_the_creates_done_before_a_failure(gateway, get_module):
+    def handler(query, data):
+        if data["object_id"] == 2:
+            return 400, {"__all__": ["Not allowed"]}
+        return 201, dict(data, id=100 + data["object_id"])
+
+    gateway.route("POST", "role_team_assignments", handler)
+    module = get_module()
+    module.max_workers = 1
+    failures = []
+
+    def error_callback(**kwargs):
+        failures.append(kwargs)
+        raise AAPModuleError(kwargs["msg"])
+
+    module.error_callback = error_callback
+    with pytest.raises(AAPModuleError, match="Not allowed"):
+        module.create_many("role_team_assignments", [{"object_id": 1}, {"object_id": 2}, {"object_id": 3}], item_type="role_team_assignment")
+
+    assert [output["id"] for output in failures[0]["created"]] == [101]
+    assert failures[0]["changed"] is True
+    assert len(gateway.sent("POST", "role_team_assignments")) == 2
+
+
+def test_delete_many_returns_the_output_of_delete_if_needed(gateway, get_module):
+    gateway.route("DELETE", "role_team_assignments", lambda query, data: (204, None))
+    module = get_module()
+    assignments = [{"id": pk, "url": "/api/gateway/v1/role_team_assignments/{0}/".format(pk)} for pk in (101, 102)]
+
+    outputs = module.delete_many(assignments)
+
+    module.delete_if_needed(assignments[0], auto_exit=False)
+    assert outputs == [{"changed": True, "id": 101}, {"changed": True, "id": 102}]
+    assert outputs[0] == module.json_output
+
+
+def test_delete_many_fails_like_delete_if_needed(gateway, get_module):
+    gateway.route("DELETE", "role_team_assignments", lambda query, data: (409, {"error": "Assignment in use"}))
+    module = get_module()
+    assignment = {"id": 101, "name": "assignment", "url": "/api/gateway/v1/role_team_assignments/101/"}
+
+    with pytest.raises(AAPModuleError) as single:
+        module.delete_if_needed(assignment, auto_exit=False)
+    with pytest.raises(AAPModuleError) as many:
+        module.delete_many([assignment, dict(assignment, id=102)])
+    assert str(many.value) == str(single.value)
+    assert "Assignment in use" in str(many.value)
+
+
+def test_get_many_sends_one_query_per_batch(gateway, get_module):
+    gateway.route("GET", "organizations", gateway.list_view(ORGANIZATIONS))
+    module = get_module()
+
+    found = module.get_many("organizations", "id", [1, 2, 2, 3, 42])
+
+    assert sorted(item["id"] for item in found) == [1, 2, 3]
+    assert [query["id__in"] for query in gateway.sent("GET", "organizations")] == ["1,2,3,42"]
+
+
+def test_get_many_bounds_batches_by_count_and_length(gateway, get_module):
+    gateway.route("GET", "organizations", gateway.list_view(ORGANIZATIONS))
+    module = get_module()
+    module.max_page_size = 2
+    module.max_in_query_length = 1000
+
+    module.get_many("organizations", "name", ["org1", "org2", "org3"])
+    assert [query["name__in"] for query in gateway.sent("GET", "organizations")] == ["org1,org2", "org3"]
+
+    del gateway.requests[:]
+    module.max_page_size = 200
+    # Each name takes 4 characters and its encoded comma 3 more
+    module.max_in_query_length = 14
+    module.get_many("organizations", "name", ["org1", "org2", "org3", "org4", "org5"])
+    assert [query["name__in"] for query in gateway.sent("GET", "organizations")] == ["org1,org2", "org3,org4", "org5"]
+
+
+def test_get_many_queries_values_with_a_comma_on_their_own(gateway, get_module):
+    organizations = ORGANIZATIONS + [{"id": 6, "name": "Acme, Inc.", "url": "/api/gateway/v1/organizations/6/"}]
+    gateway.route("GET", "organizations", gateway.list_view(organizations))
+    module = get_module()
+
+    found = module.get_many("organizations", "name", ["Acme, Inc.", "org1"])
+
+    assert sorted(item["id"] for item in found) == [1, 6]
+    sent = gateway.sent("GET", "organizations")
+    assert {"name": "Acme, Inc.", "page_size": "200"} in sent
+    assert {"name__in": "org1", "page_size": "200"} in sent
+
+
+@pytest.mark.parametrize("status", [400, 404, 414])
+def test_get_many_falls_back_to_single_queries(gateway, get_module, status):
+    view = gateway.list_view(ORGANIZATIONS)
+
+    def handler(query, data):
+        if "name__in" in query:
+            return status, {"detail": "Unsupported filter"}
+        return view(query, data)
+
+    gateway.route("GET", "organizations", handler)
+    module = get_module()
+
+    found = module.get_many("organizations", "name", ["org1", "org2", "nope"])
+
+    assert sorted(item["id"] for item in found) == [1, 2]
+    assert sorted(query.get("name") for query in gateway.sent("GET", "organizations")[1:]) == ["nope", "org1", "org2"]
+
+
+def test_get_many_fails_when_a_single_query_fails(gateway, get_module):
+    gateway.route("GET", "organizations", lambda query, data: (400, {"detail": "Unsupported filter"}))
+    module = get_module()
+
+    with pytest.raises(AAPModuleError, match="Unsupported filter"):
+        module.get_many("organizations", "name", ["org1", "org2"])
+
+
+def test_get_all_endpoint_follows_next_links(gateway, get_module):
+    pages = {
+        None: {"count": 3, "next": "https://gateway.example.com/api/gateway/v1/organizations/?page=2&page_size=1", "results": ORGANIZATIONS[:1]},
+        "2": {"count": 3, "next": "/api/gateway/v1/organizations/?page=3&page_size=1", "results": ORGANIZATIONS[1:2]},
+        "3": {"count": 3, "next": None, "results": ORGANIZATIONS[2:3]},
+    }
+    gateway.route("GET", "organizations", lambda query, data: (200, pages[query.get("page")]))
+    module = get_module()
+
+    response = module.get_all_endpoint("organizations", data={"page_size": 1})
+
+    assert [item["id"] for item in response["json"]["results"]] == [1, 2, 3]
+    assert response["json"]["next"] is None
+    assert [query.get("page") for query in gateway.sent("GET", "organizations")] == [None, "2", "3"]
+
+
+def test_get_many_follows_next_links(gateway, get_module):
+    pages = {
+        None: {"count": 2, "next": "/api/gateway/v1/organizations/?id__in=1%2C2&page=2&page_size=1", "results": ORGANIZATIONS[:1]},
+        "2": {"count": 2, "next": None, "results": ORGANIZATIONS[1:2]},
+    }
+    gateway.route("GET", "organizations", lambda query, data: (200, pages[query.get("page")]))
+
+    assert [item["id"] for item in get_module().get_many("organizations", "id", [1, 2])] == [1, 2]
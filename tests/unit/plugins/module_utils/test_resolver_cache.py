@@ -0,0 +1,143 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+
+from ansible_collections.ansible.platform.plugins.module_utils import aap_module
+from ansible_collections.ansible.platform.plugins.module_utils.aap_module import AAPModule
+
+ROLE_DEFINITIONS = [{"id": 2, "name": "Organization Admin", "url": "/api/gateway/v1/role_definitions/2/"}]
+
+
+def lookup(module):
+    return module.get_one_cached("role_definitions", "Organization Admin", allow_none=False)
+
+
+def next_task():
+    """Forget what the process looked up, as when the next task starts in a new process."""
+    AAPModule.resolve_cache.clear()
+    AAPModule.resolve_cache_files.clear()
+
+
+def cached_endpoints(module):
+    with open(module.resolver_cache_path()) as f:
+        return [key[1] for key, expires, item, fetched in json.load(f)["entries"]]
+
+
+def test_resolver_cache_file_is_shared_with_the_next_tasks(gateway, get_module):
+    gateway.route("GET", "role_definitions", gateway.list_view(ROLE_DEFINITIONS))
+    module = get_module()
+    assert lookup(module)["id"] == 2
+    assert lookup(module)["id"] == 2
+    module.save_resolver_cache()
+    assert len(gateway.sent("GET", "role_definitions")) == 1
+
+    next_task()
+    assert lookup(get_module())["id"] == 2
+    assert len(gateway.sent("GET", "role_definitions")) == 1
+
+
+def test_resolver_cache_file_expires(gateway, get_module, monkeypatch):
+    gateway.route("GET", "role_definitions", gateway.list_view(ROLE_DEFINITIONS))
+    lookup(get_module())
+    get_module().save_resolver_cache()
+
+    later = aap_module.time.time() + AAPModule.resolve_cache_file_ttl + 1
+    monkeypatch.setattr(aap_module.time, "time", lambda: later)
+    next_task()
+    lookup(get_module())
+    assert len(gateway.sent("GET", "role_definitions")) == 2
+
+
+def test_resolver_cache_file_is_not_refilled_with_invalidated_items(gateway, get_module):
+    gateway.route("GET", "role_definitions", gateway.list_view(ROLE_DEFINITIONS))
+    gateway.route("DELETE", "teams", lambda query, data: (204, None))
+    module = get_module()
+    lookup(module)
+
+    # Another task deletes something while this one still holds its lookups
+    held = dict(AAPModule.resolve_cache)
+    other = get_module()
+    other.make_request("DELETE", other.build_url("teams/1"))
+    AAPModule.resolve_cache.update(held)
+    module.save_resolver_cache()
+
+    assert cached_endpoints(module) == []
+
+
+def test_resolver_cache_file_drops_lookups_sent_during_a_write(gateway, get_module):
+    gateway.route("GET", "role_definitions", gateway.list_view(ROLE_DEFINITIONS))
+    held = {}
+
+    def create(query, data):
+        # Another task looks the endpoint up while the write is in flight, and exits before it is applied
+        other = get_module()
+        lookup(other)
+        other.save_resolver_cache()
+        held.update(AAPModule.resolve_cache)
+        return 201, dict(data, id=3)
+
+    gateway.route("POST", "role_definitions", create)
+    module = get_module()
+    module.make_request("POST", module.build_url("role_definitions"), data={"name": "Organization Auditor"})
+    assert cached_endpoints(module) == []
+
+    AAPModule.resolve_cache.update(held)
+    module.save_resolver_cache()
+    assert cached_endpoints(module) == []
+
+
+def test_resolver_cache_file_is_left_alone_by_failed_writes(gateway, get_module):
+    gateway.route("GET", "role_definitions", gateway.list_view(ROLE_DEFINITIONS))
+    gateway.route("DELETE", "teams", lambda query, data: (409, {"error": "Team in use"}))
+    module = get_module()
+    lookup(module)
+    module.save_resolver_cache()
+    with open(module.resolver_cache_path()) as f:
+        content = f.read()
+
+    module.make_request_raw_reponse("DELETE", module.build_url("teams/1"))
+
+    with open(module.resolver_cache_path()) as f:
+        assert f.read() == content
+
+
+def test_resolver_cache_path_does_not_depend_on_the_password(isolated_caches, gateway, get_module, tmp_path):
+    assert get_module().resolver_cache_path() == get_module(gateway_password="other").resolver_cache_path()
+    assert get_module().resolver_cache_path() != get_module(gateway_username="other").resolver_cache_path()
+    assert get_module().resolver_cache_path().startswith(str(tmp_path))
+
+
+def test_resolver_cache_file_drops_the_written_endpoint(gateway, get_module):
+    organizations = [{"id": 1, "name": "org1", "url": "/api/gateway/v1/organizations/1/"}]
+    gateway.route("GET", "role_definitions", gateway.list_view(ROLE_DEFINITIONS))
+    gateway.route("GET", "organizations", gateway.list_view(organizations))
+    gateway.route("PATCH", "organizations", lambda query, data: (200, dict(organizations[0], **data)))
+    module = get_module()
+    lookup(module)
+    module.get_one_cached("organizations", "org1")
+    module.save_resolver_cache()
+
+    next_task()
+    module = get_module()
+    module.make_request("PATCH", module.build_url("organizations/1"), data={"name": "renamed"})
+    next_task()
+    module = get_module()
+    lookup(module)
+    module.get_one_cached("organizations", "org1")
+    assert len(gateway.sent("GET", "role_definitions")) == 1
+    assert len(gateway.sent("GET", "organizations")) == 2
+
+
+def test_resolver_cache_file_only_holds_ids(gateway, get_module):
+    application = {"id": 7, "name": "app", "client_id": "abc", "client_secret": "$encrypted$", "url": "/api/gateway/v1/applications/7/"}
+    gateway.route("GET", "applications", gateway.list_view([application]))
+    module = get_module()
+
+    assert module.resolve_id("applications", "app") == 7
+    assert module.get_one_cached("applications", "app") == {"id": 7}
+    module.save_resolver_cache()
+
+    with open(module.resolver_cache_path()) as f:
+        assert [item for key, expires, item, fetched in json.load(f)["entries"]] == [{"id": 7}]
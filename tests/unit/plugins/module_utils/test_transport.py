@@ -0,0 +1,237 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import gzip
+import json
+import socket
+import ssl
+import threading
+
+import pytest
+from ansible.module_utils.six.moves import BaseHTTPServer
+from ansible.module_utils.six.moves.urllib.error import HTTPError
+from ansible.module_utils.six.moves.urllib.parse import urlparse
+from ansible.module_utils.urls import ConnectionError, SSLValidationError
+from ansible_collections.ansible.platform.plugins.module_utils import aap_module
+from ansible_collections.ansible.platform.plugins.module_utils.aap_module import AAPModule, AAPModuleError
+
+ORGANIZATIONS = {"count": 1, "next": None, "results": [{"id": 1, "name": "org1"}]}
+
+
+class Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+    """Answer from the routes of the server, a route being a function of the handler returning (status, headers, body)."""
+
+    def do_GET(self):
+        status, headers, body = self.server.routes.get(self.path, lambda handler: (404, {}, b'{"detail": "Not found."}'))(self)
+        self.send_response(status)
+        for name, value in dict({"Content-Type": "application/json", "Content-Length": str(len(body))}, **headers).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(monkeypatch, isolated_caches):
+    for name in ("http_proxy", "HTTP_PROXY", "https_proxy", "HTTPS_PROXY", "all_proxy", "ALL_PROXY"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setattr(AAPModule, "pools", {})
+    monkeypatch.setattr(AAPModule, "http2_clients", {})
+    httpd = BaseHTTPServer.HTTPServer(("127.0.0.1", 0), Handler)
+    httpd.routes = {"/api/gateway/v1/": lambda handler: (200, {}, b"{}")}
+    httpd.url = "http://127.0.0.1:{0}".format(httpd.server_port)
+    thread = threading.Thread(target=httpd.serve_forever, kwargs=dict(poll_interval=0.05))
+    thread.daemon = True
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def open_url(server, get_module):
+    """Return a function sending a request through the transport of a module talking to the server."""
+    module = get_module(gateway_hostname=server.url)
+
+    def open_url(path, method="GET"):
+        return module._open(method, urlparse(server.url + path))
+
+    open_url.module = module
+    return open_url
+
+
+def test_pool_follows_redirects(server, open_url):
+    server.routes["/old/"] = lambda handler: (302, {"Location": "/api/gateway/v1/organizations/"}, b"")
+    server.routes["/api/gateway/v1/organizations/"] = lambda handler: (200, {}, json.dumps(ORGANIZATIONS).encode())
+
+    response = open_url("/old/")
+
+    assert response.status == 200
+    assert json.loads(response.read()) == ORGANIZATIONS
+
+
+def test_pool_sends_the_session_headers(server, open_url):
+    seen = []
+
+    def organizations(handler):
+        seen.append(handler.headers.get("Authorization"))
+        return 200, {}, json.dumps(ORGANIZATIONS).encode()
+
+    server.routes["/api/gateway/v1/organizations/"] = organizations
+    module = open_url.module
+
+    assert module.make_request("GET", module.build_url("organizations"))["json"] == ORGANIZATIONS
+    assert seen == [module.session.headers["Authorization"]]
+
+
+@pytest.mark.parametrize("status", [404, 500])
+def test_pool_raises_http_errors(server, open_url, status):
+    server.routes["/broken/"] = lambda handler: (status, {}, b'{"detail": "Broken"}')
+
+    with pytest.raises(HTTPError) as error:
+        open_url("/broken/")
+    assert error.value.code == status
+    assert json.loads(error.value.read()) == {"detail": "Broken"}
+
+
+def test_pool_server_errors_fail_the_module(server, open_url):
+    server.routes["/api/gateway/v1/organizations/"] = lambda handler: (500, {}, b"{}")
+    module = open_url.module
+
+    with pytest.raises(AAPModuleError, match="The host sent back a server error"):
+        module.make_request("GET", module.build_url("organizations"))
+
+
+def test_pool_raises_connection_errors(open_url):
+    # A port nothing listens on
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    url = "http://127.0.0.1:{0}/api/gateway/v1/organizations/".format(sock.getsockname()[1])
+    sock.close()
+    module = open_url.module
+
+    with pytest.raises(ConnectionError):
+        module._open("GET", urlparse(url))
+    with pytest.raises(AAPModuleError, match="There was a network error of some kind"):
+        module.make_request("GET", urlparse(url))
+
+
+def test_pool_raises_ssl_validation_errors(open_url, monkeypatch):
+    pool = open_url.module._get_pool()
+
+    def request(method, url, **kwargs):
+        raise aap_module.urllib3.exceptions.MaxRetryError(pool, url, reason=aap_module.urllib3.exceptions.SSLError("certificate verify failed"))
+
+    monkeypatch.setattr(pool, "request", request)
+    with pytest.raises(SSLValidationError, match="certificate verify failed"):
+        open_url("/api/gateway/v1/")
+
+
+def gzipped(status, body):
+    return lambda handler: (status, {"Content-Encoding": "gzip"}, gzip.compress(json.dumps(body).encode()))
+
+
+@pytest.fixture(params=["pool", "request"])
+def transport(request, monkeypatch):
+    if request.param == "request":
+        monkeypatch.setattr(aap_module, "HAS_URLLIB3", False)
+    return request.param
+
+
+def test_gzipped_bodies_are_decompressed(server, open_url, transport):
+    server.routes["/api/gateway/v1/organizations/"] = gzipped(200, ORGANIZATIONS)
+    module = open_url.module
+
+    assert module.make_request("GET", module.build_url("organizations"))["json"] == ORGANIZATIONS
+
+
+def test_gzipped_error_bodies_are_decompressed(server, open_url, transport):
+    server.routes["/broken/"] = gzipped(400, {"detail": "Broken"})
+
+    with pytest.raises(HTTPError) as error:
+        open_url("/broken/")
+    assert json.loads(error.value.read()) == {"detail": "Broken"}
+
+
+class MockGateway:
+    """Serve the HTTP/2 client from routes taking an httpx request and returning an httpx response."""
+
+    def __init__(self, httpx):
+        self.httpx = httpx
+        self.routes = {"/api/gateway/v1/": lambda request: httpx.Response(200, json={})}
+        self.requests = []
+
+    def __call__(self, request):
+        self.requests.append(request)
+        route = self.routes.get(request.url.path, lambda request: self.httpx.Response(404, json={"detail": "Not found."}))
+        return route(request)
+
+
+@pytest.fixture
+def http2(monkeypatch, isolated_caches, get_module):
+    httpx = pytest.importorskip("httpx")
+    pytest.importorskip("h2")
+    for name in ("http_proxy", "HTTP_PROXY", "https_proxy", "HTTPS_PROXY", "all_proxy", "ALL_PROXY"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setattr(AAPModule, "http2_clients", {})
+    mock = MockGateway(httpx)
+    monkeypatch.setattr(aap_module.httpx, "HTTPTransport", lambda **kwargs: httpx.MockTransport(mock))
+    return mock
+
+
+def test_http2_does_not_share_cookies(http2, get_module):
+    http2.routes["/api/gateway/v1/me/"] = lambda request: http2.httpx.Response(200, headers={"Set-Cookie": "gateway_sessionid=abc; Path=/"}, json={})
+    module = get_module()
+    module.make_request("GET", module.build_url("me"))
+    module.make_request("GET", module.build_url("me"))
+    other = get_module(gateway_username="someone", gateway_password="else")
+    other.make_request("GET", other.build_url("me"))
+
+    assert len(AAPModule.http2_clients) == 1
+    assert [request.headers.get("Cookie") for request in http2.requests] == [None] * len(http2.requests)
+    assert http2.requests[-1].headers["Authorization"] == other.session.headers["Authorization"]
+
+
+def test_http2_follows_redirects(http2, get_module):
+    http2.routes["/old/"] = lambda request: http2.httpx.Response(302, headers={"Location": "/api/gateway/v1/organizations/"})
+    http2.routes["/api/gateway/v1/organizations/"] = lambda request: http2.httpx.Response(200, json=ORGANIZATIONS)
+    module = get_module()
+
+    response = module._open("GET", urlparse(module.host + "/old/"))
+
+    assert response.status == 200
+    assert json.loads(response.read()) == ORGANIZATIONS
+
+
+@pytest.mark.parametrize("status", [404, 500])
+def test_http2_raises_http_errors(http2, get_module, status):
+    http2.routes["/broken/"] = lambda request: http2.httpx.Response(status, json={"detail": "Broken"})
+    module = get_module()
+
+    with pytest.raises(HTTPError) as error:
+        module._open("GET", urlparse(module.host + "/broken/"))
+    assert error.value.code == status
+    assert json.loads(error.value.read()) == {"detail": "Broken"}
+
+
+def test_http2_raises_connection_and_ssl_validation_errors(http2, get_module):
+    def refused(request):
+        raise http2.httpx.ConnectError("Connection refused", request=request)
+
+    def untrusted(request):
+        try:
+            raise ssl.SSLError("certificate verify failed")
+        except ssl.SSLError as e:
+            raise http2.httpx.ConnectError(str(e), request=request)
+
+    http2.routes["/refused/"] = refused
+    http2.routes["/untrusted/"] = untrusted
+    module = get_module()
+
+    with pytest.raises(ConnectionError, match="Connection refused"):
+        module._open("GET", urlparse(module.host + "/refused/"))
+    with pytest.raises(SSLValidationError, match="certificate verify failed"):
+        module._open("GET", urlparse(module.host + "/untrusted/"))
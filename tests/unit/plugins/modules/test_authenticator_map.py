@@ -0,0 +1,54 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+AUTHENTICATORS = [{"id": 1, "name": "github", "url": "/api/gateway/v1/authenticators/1/"}]
+ADMINS = {
+    "id": 10,
+    "name": "admins",
+    "authenticator": 1,
+    "revoke": False,
+    "map_type": "is_superuser",
+    "triggers": {"always": {}},
+    "url": "/api/gateway/v1/authenticator_maps/10/",
+}
+
+
+def test_items_are_managed_in_one_run(gateway, run_module):
+    gateway.route("GET", "authenticators", gateway.list_view(AUTHENTICATORS))
+    gateway.route("GET", "authenticator_maps", gateway.list_view([ADMINS]))
+    gateway.route("POST", "authenticator_maps", lambda query, data: (201, dict(data, id=11, url="/api/gateway/v1/authenticator_maps/11/")))
+    items = [
+        dict(name="admins", authenticator="github", map_type="is_superuser", triggers={"always": {}}),
+        dict(name="everyone", authenticator="github", map_type="allow", triggers={"always": {}}),
+    ]
+
+    result = run_module("authenticator_map", dict(items=items))
+
+    assert not result["failed"], result
+    assert result["changed"]
+    assert [item["changed"] for item in result["results"]] == [False, True]
+    assert len(gateway.sent("POST", "authenticator_maps")) == 1
+    # The authenticator shared by both items is looked up once
+    assert len(gateway.sent("GET", "authenticators")) == 1
+
+
+def test_items_can_be_absent(gateway, run_module):
+    gateway.route("GET", "authenticators", gateway.list_view(AUTHENTICATORS))
+    gateway.route("GET", "authenticator_maps", gateway.list_view([ADMINS]))
+    gateway.route("DELETE", "authenticator_maps", lambda query, data: (204, None))
+    items = [dict(name="admins", authenticator="github", state="absent"), dict(name="missing", authenticator="github", state="absent")]
+
+    result = run_module("authenticator_map", dict(items=items))
+
+    assert not result["failed"], result
+    assert [item["changed"] for item in result["results"]] == [True, False]
+    assert [path for method, path, query in gateway.requests if method == "DELETE"] == ["/api/gateway/v1/authenticator_maps/10/"]
+
+
+def test_items_reject_top_level_map_options(gateway, run_module):
+    result = run_module("authenticator_map", dict(items=[dict(name="admins", authenticator="github")], state="absent"))
+
+    assert result["failed"]
+    assert "mutually exclusive" in result["msg"]
+    assert gateway.requests == []
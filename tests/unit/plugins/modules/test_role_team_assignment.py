@@ -0,0 +1,67 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import pytest
+from ansible_collections.ansible.platform.plugins.module_utils.aap_module import AAPModuleError
+from ansible_collections.ansible.platform.plugins.modules.role_team_assignment import _selector, resolve_assignment_objects
+
+ORGANIZATIONS = [
+    {
+        "id": pk,
+        "name": "org{0}".format(pk),
+        "url": "/api/gateway/v1/organizations/{0}/".format(pk),
+        "summary_fields": {"resource": {"ansible_id": "uuid-{0}".format(pk)}},
+    }
+    for pk in range(1, 6)
+]
+
+
+def selector(name=None, type=None, object_id=None, object_ansible_id=None):
+    return dict(name=name, type=type, object_id=object_id, object_ansible_id=object_ansible_id)
+
+
+def test_resolve_assignment_objects_sends_one_query_per_selector(gateway, get_module):
+    gateway.route("GET", "organizations", gateway.list_view(ORGANIZATIONS))
+    objects = [
+        selector(name="org1", type="organizations"),
+        selector(object_id=2),
+        selector(object_ansible_id="uuid-3"),
+        selector(name="org4", type="organizations"),
+        selector(object_id=5),
+    ]
+
+    assert resolve_assignment_objects(get_module(), objects, "organizations") == [1, 2, 3, 4, 5]
+    assert sorted(sorted(query) for query in gateway.sent("GET", "organizations")) == [
+        ["id__in", "page_size"],
+        ["name__in", "page_size"],
+        ["page_size", "resource__ansible_id__in"],
+    ]
+
+
+def test_resolve_assignment_objects_looks_up_missing_names_as_ids(gateway, get_module):
+    gateway.route("GET", "organizations", gateway.list_view(ORGANIZATIONS))
+
+    assert resolve_assignment_objects(get_module(), [selector(name="3", type="organizations")], "organizations") == [3]
+
+
+def test_resolve_assignment_objects_fails_on_unknown_objects(gateway, get_module):
+    gateway.route("GET", "organizations", gateway.list_view(ORGANIZATIONS))
+
+    with pytest.raises(AAPModuleError, match="Unable to find organizations with id 42"):
+        resolve_assignment_objects(get_module(), [selector(object_id=1), selector(object_id=42)], "organizations")
+
+
+def test_resolve_assignment_objects_fails_on_ambiguous_names(gateway, get_module):
+    duplicate = dict(ORGANIZATIONS[1], id=6, name="org1")
+    gateway.route("GET", "organizations", gateway.list_view(ORGANIZATIONS + [duplicate]))
+
+    with pytest.raises(AAPModuleError, match="More than one organizations found with name org1"):
+        resolve_assignment_objects(get_module(), [selector(name="org1", type="organizations")], "organizations")
+
+
+def test_selector_takes_any_object_id_the_validation_accepts(gateway, get_module):
+    module = get_module()
+
+    assert _selector(module, selector(object_id=0), "organizations") == ("organizations", "id", "0")
+    assert _selector(module, selector(object_ansible_id="uuid-1"), "organizations") == ("organizations", "resource__ansible_id", "uuid-1")
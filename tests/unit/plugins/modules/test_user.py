@@ -0,0 +1,47 @@
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+ALICE = {"id": 5, "username": "alice", "url": "/api/gateway/v1/users/5/"}
+ORGANIZATIONS = [{"id": pk, "name": "org{0}".format(pk), "url": "/api/gateway/v1/organizations/{0}/".format(pk)} for pk in range(1, 4)]
+ROLE_DEFINITIONS = [{"id": 7, "name": "Organization Member", "url": "/api/gateway/v1/role_definitions/7/"}]
+
+
+def route_lookups(gateway, users):
+    gateway.route("GET", "users", gateway.list_view(users))
+    gateway.route("GET", "organizations", gateway.list_view(ORGANIZATIONS))
+    gateway.route("GET", "role_definitions", gateway.list_view(ROLE_DEFINITIONS))
+
+
+def test_organizations_are_resolved_in_one_query_and_associated(gateway, run_module):
+    route_lookups(gateway, [ALICE])
+    assignments = []
+
+    def assign(query, data):
+        assignments.append(data)
+        return 201, dict(data, id=100 + data["object_id"])
+
+    gateway.route("POST", "role_user_assignments", assign)
+
+    result = run_module("user", dict(username="alice", organizations=["org1", "org2", "3"]))
+
+    assert not result["failed"], result
+    assert result["changed"]
+    # The names are resolved together, the id that matches no name is looked up on its own
+    assert [query.get("name__in") for query in gateway.sent("GET", "organizations")] == ["org1,org2,3", None]
+    assert sorted((data["object_id"], data["user"], data["role_definition"]) for data in assignments) == [(1, 5, 7), (2, 5, 7), (3, 5, 7)]
+
+
+def test_missing_organizations_remove_the_created_user(gateway, run_module):
+    route_lookups(gateway, [])
+    gateway.route("POST", "users", lambda query, data: (201, dict(ALICE, **data)))
+    gateway.route("DELETE", "users", lambda query, data: (204, None))
+
+    result = run_module("user", dict(username="alice", organizations=["org1", "nope"]))
+
+    assert result["failed"]
+    assert "Organization 'nope' not found. Please ensure it exists and is accessible." in result["msg"]
+    assert "\nNewly created user 'alice' was removed." in result["msg"]
+    assert [path for method, path, query in gateway.requests if method == "DELETE"] == ["/api/gateway/v1/users/5/"]
+    # The organizations that were found are associated before the user is removed
+    assert len(gateway.sent("POST", "role_user_assignments")) == 1